@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, send_file
+from flask import Flask, render_template, request, jsonify, session, redirect, send_file, make_response, stream_with_context
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -6,10 +6,23 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import bcrypt
 import portalocker
 import pandas as pd
+import numpy as np
+import openpyxl
 import json
 import os
+import pickle
+import shutil
+import hashlib
 import secrets
+import sqlite3
 import threading
+import queue
+import bisect
+import copy
+from collections import deque
+from array import array
+from concurrent.futures import Future
+import atexit
 import time
 from functools import wraps
 import qrcode
@@ -43,11 +56,15 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 QR_CODE_BASE_URL = os.environ.get('QR_CODE_BASE_URL', None)
 
 EXCEL_PATH = os.path.join(BASE_DIR, "data", "registrations.xlsx")
+EXCEL_SNAPSHOT_PATH = EXCEL_PATH + ".snapshot"  # Typed pickle of the parsed workbook
 COLUMN_MAP_PATH = os.path.join(BASE_DIR, "data", "column_map.json")
-STATUS_PATH = os.path.join(BASE_DIR, "data", "status.json")
+STATUS_PATH = os.path.join(BASE_DIR, "data", "status.json")  # Legacy format: migrated once, kept for exports
+STATUS_DB_PATH = os.path.join(BASE_DIR, "data", "status.db")
 EVENT_CODES_PATH = os.path.join(BASE_DIR, "data", "event_codes.json")
 EVENT_RATINGS_PATH = os.path.join(BASE_DIR, "data", "event_ratings.json")
 EVENT_REQUESTS_PATH = os.path.join(BASE_DIR, "data", "event_requests.json")
+COLLEGES_PATH = os.path.join(BASE_DIR, "data", "colleges.json")
+SPOT_JOURNAL_PATH = os.path.join(BASE_DIR, "data", "spot_journal.ndjson")  # Pending spot registrations
 
 # Secure hashed passwords using bcrypt
 USERS = {
@@ -201,60 +218,492 @@ def page_role_required(*allowed_roles):
 _excel_cache = None
 _excel_cache_time = None
 _excel_file_mtime = None  # Track file modification time
+_excel_file_key = None  # (mtime_ns, size, schema) the cached frame was read from
+_excel_schema_key = None  # Ingest schema the cached frame was read with (None = all columns)
 _column_map_cache = None
 _status_cache = None
+_event_codes_cache = None
+_event_ratings_cache = None
+_colleges_cache = None
+_spot_journal_cache = None
+_spot_journal_keys = None  # Normalized reg_nos of the cached journal's append records
+_spot_journal_rosters = None  # reg_no key -> team tuple of the cached journal's append records
+_spot_journal_dirty = None  # reg_no keys whose team cells a journaled patch touched
 CACHE_TIMEOUT = 60  # Reduced to 1 minute for fresher data
+COHERENCE_INTERVAL = 1.0  # Max seconds before a worker sees another worker's committed write
 EXCEL_CHUNK_SIZE = 1000  # Process Excel in chunks
+# "projected" reads only the columns named in column_map.json (plus contact/email/team
+# heuristics) with compact dtypes; "full" reads every column of the workbook.
+EXCEL_INGEST_MODE = os.environ.get("EXCEL_INGEST_MODE", "projected")
+# Workbooks above this size are streamed row by row (openpyxl read_only) instead of parsed whole
+EXCEL_STREAMING_THRESHOLD = int(os.environ.get("EXCEL_STREAMING_THRESHOLD", 50 * 1024 * 1024))
+EXCEL_PROGRESS_ROWS = 50000  # Report streaming progress every N rows
+
+# Per-resource generations. A write bumps only the resource it touched, and
+# derived views (indexes, catalogs, dashboards) are rebuilt only when one of
+# the resources they were built from has moved on.
+_cache_generations = {
+    "workbook": 0,
+    "column_map": 0,
+    "status": 0,
+    "event_codes": 0,
+    "ratings": 0,
+    "colleges": 0,
+    "journal": 0
+}
+_derived_cache = {}  # view name -> (depends_on, generations, value)
+_cache_lock = threading.RLock()  # Guards the cache globals above
+
+def cache_generation(*resources):
+    """Current generation tuple for the given resources"""
+    return tuple(_cache_generations[name] for name in resources)
+
+def _bump_generation(resource):
+    """Move a resource to a new generation and drop the views derived from it"""
+    with _cache_lock:
+        _cache_generations[resource] += 1
+        stale = [name for name, (depends_on, _, _) in _derived_cache.items() if resource in depends_on]
+        for name in stale:
+            _derived_cache.pop(name, None)
+
+def get_derived_view(name, depends_on, build):
+    """Return a view derived from the given resources, rebuilding it only when one of them changed"""
+    generations = cache_generation(*depends_on)
+    cached = _derived_cache.get(name)
+    if cached is not None and cached[1] == generations:
+        return cached[2]
+
+    value = build()
+    with _cache_lock:
+        # Don't store a view whose inputs moved on while it was being built
+        if cache_generation(*depends_on) == generations:
+            _derived_cache[name] = (tuple(depends_on), generations, value)
+    return value
+
+# Workbook loads are single-flight: one caller reloads while the others keep
+# serving the previous generation (stale-while-revalidate). Only a cold or
+# explicitly invalidated cache makes callers wait for the reload.
+EXCEL_BACKGROUND_RELOAD = True  # Revalidate stale data in a background thread
+_excel_reload_lock = threading.Lock()  # Held by the one caller doing the reload
+_excel_stats = {
+    "hits": 0,
+    "stale_hits": 0,
+    "misses": 0,
+    "reloads": 0,
+    "unchanged_reloads": 0,
+    "reload_errors": 0,
+    "last_reload_ms": 0.0,
+    "total_reload_ms": 0.0
+}
 
-def load_excel():
-    """Load Excel file with optimized caching and file modification checking"""
-    global _excel_cache, _excel_cache_time, _excel_file_mtime
+# Progress of the current (or last) workbook parse, for /cache_stats
+_excel_ingest_progress = {"mode": None, "rows": 0, "total_rows": None, "done": True}
+
+def _count_excel_stat(name, amount=1):
+    with _cache_lock:
+        _excel_stats[name] += amount
+
+def _set_ingest_progress(mode, rows=0, total_rows=None, done=False):
+    with _cache_lock:
+        _excel_ingest_progress.update(mode=mode, rows=rows, total_rows=total_rows, done=done)
+
+def _reload_excel():
+    """Re-read the workbook and publish it as a new generation; caller holds _excel_reload_lock"""
+    global _excel_cache, _excel_cache_time, _excel_file_mtime, _excel_schema_key, _excel_file_key
+
+    print("DEBUG: Loading Excel from disk (cache expired)")
+    
+    # Validate file path
+    if not EXCEL_PATH or not os.path.exists(EXCEL_PATH):
+        raise ValueError("Invalid file path")
+    
+    started = time.perf_counter()
+    stat = os.stat(EXCEL_PATH)
+    mtime = stat.st_mtime
+    schema = get_ingest_schema()
+    file_key = (stat.st_mtime_ns, stat.st_size, schema.signature if schema is not None else None)
+    with _cache_lock:
+        if _excel_cache is not None and _excel_file_key == file_key:
+            # TTL expiry on an untouched file: keep the generation, so ETags,
+            # long-poll versions and roster cursors stay valid
+            _excel_cache_time = time.time()
+            _excel_stats["unchanged_reloads"] += 1
+            print("DEBUG: Workbook unchanged, keeping the cached generation")
+            return _excel_cache
+    # Load from the snapshot sidecar, parsing the workbook only if it changed
+    try:
+        df = read_workbook(schema)
+    except Exception as e:
+        _count_excel_stat("reload_errors")
+        print(f"ERROR: Failed to load Excel: {e}")
+        raise ValueError(f"Failed to load Excel file: {str(e)}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
     
+    with _cache_lock:
+        _excel_cache = df
+        _excel_cache_time = time.time()
+        _excel_file_mtime = mtime
+        _excel_file_key = file_key
+        _excel_schema_key = schema.signature if schema is not None else None
+        _excel_stats["reloads"] += 1
+        _excel_stats["last_reload_ms"] = round(elapsed_ms, 2)
+        _excel_stats["total_reload_ms"] = round(_excel_stats["total_reload_ms"] + elapsed_ms, 2)
+        _bump_generation("workbook")
+        _adopt_streamed_reg_index(df)
+    notify_roster_feed(None)  # Teams, colleges or contacts may have changed
+    return df
+
+def _revalidate_excel():
+    """Reload stale workbook data unless another caller is already doing it"""
+    if not _excel_reload_lock.acquire(blocking=False):
+        return
+    try:
+        _reload_excel()
+    except Exception as e:
+        print(f"ERROR: Background Excel reload failed: {e}")
+    finally:
+        _excel_reload_lock.release()
+
+def _load_workbook_frame():
+    """Load registrations.xlsx with single-flight, stale-while-revalidate caching"""
     current_time = time.time()
     
     # Check if file has been modified
     try:
         current_mtime = os.path.getmtime(EXCEL_PATH)
-        if _excel_file_mtime != current_mtime:
-            print("DEBUG: Excel file modified, invalidating cache")
-            _excel_cache = None
-            _excel_cache_time = None
-            _excel_file_mtime = current_mtime
     except OSError:
-        pass
+        current_mtime = _excel_file_mtime
+    
+    # A column map change alters which columns are read: treat the cache as cold
+    schema = get_ingest_schema()
+    if _excel_cache is not None and _excel_schema_key != (schema.signature if schema is not None else None):
+        invalidate_resource("workbook")
+    
+    with _cache_lock:
+        cached = _excel_cache
+        fresh = (cached is not None and
+                 _excel_cache_time is not None and
+                 current_time - _excel_cache_time < CACHE_TIMEOUT and
+                 _excel_file_mtime == current_mtime)
     
     # Return cached data if still valid
-    if (_excel_cache is not None and 
-        _excel_cache_time is not None and 
-        current_time - _excel_cache_time < CACHE_TIMEOUT):
+    if fresh:
+        _count_excel_stat("hits")
         print("DEBUG: Using cached Excel data")
-        return _excel_cache
+        return cached
     
-    print("DEBUG: Loading Excel from disk (cache expired)")
-    
-    # Validate file path
-    if not EXCEL_PATH or not os.path.exists(EXCEL_PATH):
-        raise ValueError("Invalid file path")
+    # Stale: serve the previous generation while a single caller revalidates
+    if cached is not None:
+        _count_excel_stat("stale_hits")
+        print("DEBUG: Excel cache stale, serving previous generation while reloading")
+        if _excel_reload_lock.locked():
+            pass  # Another caller is already reloading
+        elif EXCEL_BACKGROUND_RELOAD:
+            threading.Thread(target=_revalidate_excel, daemon=True).start()
+        else:
+            _revalidate_excel()
+        return _excel_cache if _excel_cache is not None else cached
     
-    # Load Excel with optimized reading
+    # Cold: nothing to serve, so wait for the one in-flight load
+    _count_excel_stat("misses")
+    with _excel_reload_lock:
+        if _excel_cache is not None:
+            return _excel_cache
+        return _reload_excel()
+
+def load_excel():
+    """Registrations view: the cached workbook with journaled spot registrations overlaid"""
+    base = _load_workbook_frame()
     try:
-        # Use chunked reading for large files
-        if os.path.getsize(EXCEL_PATH) > 50 * 1024 * 1024:  # 50MB threshold
-            print("DEBUG: Large Excel file detected, using chunked reading")
-            _excel_cache = pd.read_excel(EXCEL_PATH, engine='openpyxl')
+        base_current = os.path.getmtime(EXCEL_PATH) == _excel_file_mtime
+    except OSError:
+        base_current = True
+    # While a stale workbook is served, keep the journal it was paired with: a
+    # compaction rewrites the xlsx before trimming, so its rows stay visible
+    records = load_spot_journal(refresh=base_current)
+    if not records:
+        return base
+    return _overlay_journal(base, records)
+
+def get_excel_cache_stats():
+    """Snapshot of workbook cache counters and resource generations"""
+    with _cache_lock:
+        stats = dict(_excel_stats)
+        stats["generations"] = dict(_cache_generations)
+        stats["cache_age_s"] = round(time.time() - _excel_cache_time, 1) if _excel_cache_time else None
+        stats["reload_in_progress"] = _excel_reload_lock.locked()
+        stats["ingest"] = dict(_excel_ingest_progress)
+    return stats
+
+def _hash_file(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _parse_workbook(schema=None):
+    """Parse registrations.xlsx with openpyxl, reading only the schema's columns if one is given"""
+    if os.path.getsize(EXCEL_PATH) > EXCEL_STREAMING_THRESHOLD:
+        print("DEBUG: Large Excel file detected, using streaming ingest")
+        return _stream_workbook(schema)
+
+    _set_ingest_progress("parse")
+    usecols = schema.wants if schema is not None else None
+    df = pd.read_excel(EXCEL_PATH, usecols=usecols)
+    if schema is not None:
+        df = schema.apply_dtypes(df)
+    _set_ingest_progress("parse", rows=len(df), total_rows=len(df), done=True)
+    return df
+
+def _header_names(header):
+    """Column names for a raw header row, named the way pd.read_excel names them"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or str(value).strip() == "" else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _read_header(path=None):
+    """Header row of registrations.xlsx (or another xlsx) without loading the sheet"""
+    wb = openpyxl.load_workbook(path or EXCEL_PATH, read_only=True, data_only=True)
+    try:
+        header = next(wb.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+    return _header_names(header)
+
+class _CategoryColumn:
+    """Column accumulated as int32 category codes plus a category list"""
+    def __init__(self):
+        self.codes = array("i")
+        self.lookup = {}
+
+    def append(self, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            self.codes.append(-1)
+            return
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.lookup)
+        self.codes.append(code)
+
+    def to_series(self):
+        categories = list(self.lookup)
+        if len(set(map(type, categories))) > 1:
+            # Mixed str/number categories would not sort; fall back to plain values
+            return pd.Series([None if c < 0 else categories[c] for c in self.codes], dtype=object)
+        codes = np.frombuffer(self.codes, dtype=np.int32) if len(self.codes) else np.empty(0, dtype=np.int32)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories))
+
+def _stream_workbook(schema=None):
+    """
+    Build the registrations DataFrame row by row with openpyxl's read_only reader.
+    Only the schema's columns are kept, categorical fields as int32 codes, and the
+    reg_no index is built in the same pass, so peak memory is the resident frame
+    rather than the whole parsed worksheet.
+    """
+    global _streamed_reg_index
+
+    wb = openpyxl.load_workbook(EXCEL_PATH, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        total_rows = ws.max_row - 1 if ws.max_row else None  # From the sheet's dimension tag, if present
+        rows = ws.iter_rows(values_only=True)
+        names = _header_names(next(rows, ()))
+
+        string_cols = set()
+        category_cols = set()
+        if schema is not None:
+            string_cols = {schema.fields.get(f) for f in schema.STRING_FIELDS} - {None}
+            category_cols = {schema.fields.get(f) for f in schema.CATEGORICAL_FIELDS} - {None} - string_cols
+        keep = [(i, name) for i, name in enumerate(names) if schema is None or schema.wants(name)]
+        reg_col = schema.fields.get("reg_no") if schema is not None else None
+
+        columns = {}
+        for _, name in keep:
+            columns[name] = _CategoryColumn() if name in category_cols else []
+        reg_pos = next((i for i, name in keep if name == reg_col), None)
+        reg_index = {}
+
+        _set_ingest_progress("stream", rows=0, total_rows=total_rows)
+        count = 0
+        blank_rows = 0
+        for row in rows:
+            if not any(v is not None and v != "" for v in row):
+                # Same as read_excel: blank rows inside the sheet become empty rows,
+                # trailing ones (formatted-but-empty cells) are dropped
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                for _, name in keep:
+                    columns[name].append(None)
+            count += blank_rows
+            blank_rows = 0
+            for i, name in keep:
+                value = row[i] if i < len(row) else None
+                if name in string_cols:
+                    value = _cell_string(value)
+                columns[name].append(value)
+            if reg_pos is not None:
+                reg_key = normalize_reg_no(row[reg_pos] if reg_pos < len(row) else None)
+                if reg_key and reg_key not in reg_index:
+                    reg_index[reg_key] = count
+            count += 1
+            if count % EXCEL_PROGRESS_ROWS == 0:
+                _set_ingest_progress("stream", rows=count, total_rows=total_rows)
+                print(f"DEBUG: Streamed {count}{f'/{total_rows}' if total_rows else ''} workbook rows")
+    finally:
+        wb.close()
+
+    data = {}
+    for name, values in columns.items():
+        if isinstance(values, _CategoryColumn):
+            data[name] = values.to_series()
+        elif name in string_cols:
+            data[name] = pd.Series(values, dtype=object)
         else:
-            _excel_cache = pd.read_excel(EXCEL_PATH)
+            data[name] = pd.Series(values)
+        columns[name] = None  # Release the row buffers as each column is converted
+    df = pd.DataFrame(data, columns=[name for _, name in keep])
+    if reg_col in df.columns:
+        _streamed_reg_index = (df, reg_col, reg_index)  # Seeded by _reload_excel() once published
+    _set_ingest_progress("stream", rows=count, total_rows=count, done=True)
+    print(f"DEBUG: Streamed {count} workbook rows ({len(df.columns)} columns)")
+    return df
+
+def _read_snapshot(stat, schema_key=None):
+    """
+    Return the snapshot DataFrame if it was taken from the current workbook, else None.
+    The snapshot file holds two pickles: a small key dict followed by the DataFrame,
+    so a stale snapshot is rejected without unpickling the frame.
+    """
+    if not os.path.exists(EXCEL_SNAPSHOT_PATH):
+        return None, None
+
+    try:
+        with open(EXCEL_SNAPSHOT_PATH, "rb") as f:
+            key = pickle.load(f)
+            if key.get("size") != stat.st_size or key.get("schema") != schema_key:
+                return None, None
+
+            # Size and mtime match: trust the snapshot without hashing
+            if key.get("mtime_ns") == stat.st_mtime_ns:
+                return pickle.load(f), None
+
+            # Only mtime changed (touch, copy2, backup restore): compare content
+            digest = _hash_file(EXCEL_PATH)
+            if key.get("sha256") == digest:
+                return pickle.load(f), digest
+            return None, digest
     except Exception as e:
-        print(f"ERROR: Failed to load Excel: {e}")
-        raise ValueError(f"Failed to load Excel file: {str(e)}")
-    
-    _excel_cache_time = current_time
-    return _excel_cache
+        print(f"DEBUG: Ignoring unreadable Excel snapshot: {e}")
+        return None, None
+
+def _write_snapshot(df, stat, digest=None, schema_key=None):
+    """Atomically write the snapshot sidecar for the workbook described by stat"""
+    key = {
+        "schema": schema_key,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest or _hash_file(EXCEL_PATH)
+    }
+    tmp_path = EXCEL_SNAPSHOT_PATH + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, EXCEL_SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"DEBUG: Failed to write Excel snapshot: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def read_workbook(schema=None):
+    """
+    Read registrations.xlsx through its snapshot sidecar.
+    The xlsx is only parsed when its size, mtime and content hash (or the ingest schema) no longer match.
+    """
+    schema_key = schema.signature if schema is not None else None
+    stat = os.stat(EXCEL_PATH)
+    df, digest = _read_snapshot(stat, schema_key)
+    if df is not None:
+        print("DEBUG: Loaded Excel data from snapshot")
+        if digest is not None:
+            # Same content under a new mtime: re-key so the next load skips hashing
+            _write_snapshot(df, stat, digest, schema_key)
+        return df
+
+    print("DEBUG: Parsing Excel workbook")
+    df = _parse_workbook(schema)
+    # Re-stat in case the file was replaced while we were parsing
+    if os.stat(EXCEL_PATH).st_mtime_ns == stat.st_mtime_ns:
+        _write_snapshot(df, stat, digest, schema_key)
+    return df
+
+def read_excel_columns():
+    """All column names in registrations.xlsx (the cached frame may be column-projected)"""
+    def build():
+        return [str(c) for c in _read_header()]
+    _load_workbook_frame()
+    return get_derived_view("excel_columns", ("workbook",), build)
+
+def spot_contact_columns():
+    """(contact column, email column) of registrations.xlsx for spot registrations; the last match wins"""
+    def build():
+        contact_col = None
+        email_col = None
+        for col in read_excel_columns():
+            col_lower = str(col).lower()
+            if "contact" in col_lower or "phone" in col_lower or "mobile" in col_lower:
+                contact_col = col
+            if "email" in col_lower:
+                email_col = col
+        return contact_col, email_col
+    _load_workbook_frame()
+    return get_derived_view("spot_contact_columns", ("workbook",), build)
+
+# Signatures of the JSON files backing cached resources, so a worker notices
+# when another gunicorn worker rewrites one. Checked at most every COHERENCE_INTERVAL.
+_file_signatures = {}  # resource -> (signature, checked_at)
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+def _check_file_resource(resource, path):
+    """Invalidate a file-backed resource if the file changed since it was last checked"""
+    now = time.monotonic()
+    seen = _file_signatures.get(resource)
+    if seen is not None and now - seen[1] < COHERENCE_INTERVAL:
+        return
+    signature = _file_signature(path)
+    if seen is not None and seen[0] != signature:
+        print(f"DEBUG: {os.path.basename(path)} changed on disk")
+        invalidate_resource(resource)
+    _file_signatures[resource] = (signature, now)
+
+def _remember_file_signature(resource, path):
+    """Record our own write so it isn't mistaken for another worker's"""
+    _file_signatures[resource] = (_file_signature(path), time.monotonic())
 
 def load_column_map():
     """Load column mapping with caching"""
     global _column_map_cache
     
+    _check_file_resource("column_map", COLUMN_MAP_PATH)
     if _column_map_cache is not None:
         return _column_map_cache
     
@@ -266,68 +715,1372 @@ def load_column_map():
     
     return _column_map_cache
 
+def invalidate_resource(*resources):
+    """Invalidate only the given cached resources and the views derived from them"""
+    global _excel_cache, _excel_cache_time, _column_map_cache, _status_cache
+    global _event_codes_cache, _event_ratings_cache, _colleges_cache
+
+    with _cache_lock:
+        _invalidate_locked(resources)
+    print(f"DEBUG: Cache invalidated: {', '.join(resources)}")
+
+def _invalidate_locked(resources):
+    global _excel_cache, _excel_cache_time, _column_map_cache, _status_cache
+    global _event_codes_cache, _event_ratings_cache, _colleges_cache
+    global _spot_journal_cache, _spot_journal_keys
+    global _spot_journal_rosters, _spot_journal_dirty, _journal_overlay, _journal_overlay_step
+
+    for resource in resources:
+        if resource == "workbook":
+            _excel_cache = None
+            _excel_cache_time = None
+        elif resource == "column_map":
+            _column_map_cache = None
+        elif resource == "status":
+            _status_cache = None
+        elif resource == "event_codes":
+            _event_codes_cache = None
+        elif resource == "ratings":
+            _event_ratings_cache = None
+        elif resource == "colleges":
+            _colleges_cache = None
+        elif resource == "journal":
+            _spot_journal_cache = None
+            _spot_journal_keys = None
+        if resource in ("journal", "column_map"):
+            _spot_journal_rosters = None
+            _spot_journal_dirty = None
+        if resource in ("workbook", "journal", "column_map"):
+            _journal_overlay = None
+            _journal_overlay_step = None
+        _bump_generation(resource)
+        if resource in ("workbook", "journal", "column_map"):
+            notify_roster_feed(None)  # Teams, colleges or contacts may have changed
+
+def invalidate_cache():
+    """Invalidate all caches (use invalidate_resource for targeted writes)"""
+    invalidate_resource(*_cache_generations)
+
+# ---------------- REGISTRATION INDEX ---------------- #
+
+# key -> (frame, reg_no -> row position) for the most recent frames (the workbook
+# and its journal overlay), rebuilt once per load_excel() generation. Holding the
+# frame keeps its id() from being reused while the entry exists.
+_reg_index_cache = {}
+REG_INDEX_SLOTS = 2
+# (frame, reg_col, index) built by the streaming ingest, seeded once the frame is published
+_streamed_reg_index = None
+
+def normalize_reg_no(value):
+    """Normalize a registration number for lookups (strip, casefold, 1234.0 -> '1234')"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if pd.isna(value):
+            return ""
+        if value.is_integer():
+            value = int(value)
+    return str(value).strip().casefold()
+
+def canonical_reg_no(value):
+    """Registration number as stored in the workbook, used as the status.json key"""
+    if isinstance(value, float) and not pd.isna(value) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def get_reg_index(df, mapping):
+    """Return the reg_no -> row position index for the given DataFrame"""
+    reg_col = (mapping or {}).get("reg_no")
+    if df is None or not reg_col or reg_col not in df.columns:
+        return {}
+
+    key = (_cache_generations["workbook"], id(df), len(df), reg_col)
+    cached = _reg_index_cache.get(key)
+    if cached is not None and cached[0] is df:
+        return cached[1]
+
+    index = {}
+    for pos, value in enumerate(df[reg_col].tolist()):
+        reg_key = normalize_reg_no(value)
+        # Keep the first occurrence, same as row.iloc[0] on a boolean filter
+        if reg_key and reg_key not in index:
+            index[reg_key] = pos
+    _seed_reg_index(df, reg_col, index)
+    return index
+
+def _seed_reg_index(df, reg_col, index):
+    """Cache an index for df under the current workbook generation, so get_reg_index() does not rebuild it"""
+    with _cache_lock:
+        key = (_cache_generations["workbook"], id(df), len(df), reg_col)
+        while len(_reg_index_cache) >= REG_INDEX_SLOTS and key not in _reg_index_cache:
+            _reg_index_cache.pop(next(iter(_reg_index_cache)))
+        _reg_index_cache[key] = (df, index)
+
+def _adopt_streamed_reg_index(df):
+    """Seed the index the streaming ingest built for df, now that df is the published workbook"""
+    global _streamed_reg_index
+    streamed, _streamed_reg_index = _streamed_reg_index, None
+    if streamed is not None and streamed[0] is df:
+        _seed_reg_index(df, streamed[1], streamed[2])
+
+def find_registration_position(df, mapping, reg_no):
+    """Return the row position of reg_no in df, or None if it is not registered"""
+    return get_reg_index(df, mapping).get(normalize_reg_no(reg_no))
+
+def find_registration(df, mapping, reg_no):
+    """Return the workbook row (Series) for reg_no, or None if it is not registered"""
+    pos = find_registration_position(df, mapping, reg_no)
+    if pos is None:
+        return None
+    return df.iloc[pos]
+
+# ---------------- REGISTRATION SCHEMA ---------------- #
+
+def _cell_string(value):
+    """Normalized string for an id-like cell (reg_no, phone): 9036974859.0 -> '9036974859', blanks -> None"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    value = canonical_reg_no(value)
+    return value or None
+
+class RegistrationSchema:
+    """
+    Columns and dtypes the app needs from registrations.xlsx, derived from column_map.json.
+    Used as pd.read_excel(usecols=...) so the resident DataFrame holds only those columns.
+    """
+    STRING_FIELDS = ("reg_no", "contact")
+    CATEGORICAL_FIELDS = ("event", "college", "specify_college")
+    # Unmapped columns that are still found by name heuristics elsewhere
+    # (spot registration contact/email, extra team member columns in the roster table)
+    HEURISTIC_KEYWORDS = ("contact", "phone", "mobile", "email")
+    TEAM_COLUMNS = ("participants", "students")
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self.fields = {k: v for k, v in mapping.items() if isinstance(v, str) and v}
+        self.team_members = [c for c in mapping.get("team_members", []) if c]
+        self.columns = set(self.fields.values()) | set(self.team_members)
+        self._folded = {str(c).strip().lower() for c in self.columns}
+        self.signature = json.dumps(mapping, sort_keys=True)
+
+    def wants(self, column):
+        """usecols predicate"""
+        name = str(column).strip().lower()
+        return (column in self.columns or
+                name in self._folded or
+                name in self.TEAM_COLUMNS or
+                any(keyword in name for keyword in self.HEURISTIC_KEYWORDS))
+
+    def apply_dtypes(self, df):
+        string_cols = {self.fields.get(f) for f in self.STRING_FIELDS} - {None}
+        for col in string_cols:
+            if col in df.columns:
+                df[col] = df[col].map(_cell_string).astype(object)
+        for field in self.CATEGORICAL_FIELDS:
+            col = self.fields.get(field)
+            if col in df.columns and col not in string_cols:
+                df[col] = df[col].astype("category")
+        return df
+
+def get_ingest_schema():
+    """RegistrationSchema for projected ingest, or None to read every column"""
+    if EXCEL_INGEST_MODE != "projected":
+        return None
+    mapping = load_column_map()
+    if not mapping or not mapping.get("reg_no"):
+        return None
+    return get_derived_view("ingest_schema", ("column_map",), lambda: RegistrationSchema(mapping))
+
+# ---------------- SPOT REGISTRATION JOURNAL ---------------- #
+
+# Spot registrations are appended to an NDJSON journal (one fsync'd line per
+# submission) instead of rewriting registrations.xlsx. load_excel() overlays
+# the journal on the cached workbook, and a background compactor folds the
+# journal into the xlsx and trims what it folded. "append" records add a spot
+# registration; "patch" records set cells of an existing row (deferred edits).
+# Compaction loads the whole workbook with openpyxl (not read_only: it has to
+# write), which holds every cell as a Python object, tens of times the xlsx size
+# in memory, so it only runs once SPOT_JOURNAL_COMPACT_ROWS records are pending.
+# Below that the journal stays overlaid, which costs little per record.
+SPOT_JOURNAL_LOCK_PATH = SPOT_JOURNAL_PATH + ".lock"
+SPOT_JOURNAL_COMPACT_INTERVAL = 30  # Seconds between checks for other workers' pending records
+SPOT_JOURNAL_COMPACT_ROWS = 200  # Compact once this many records are pending
+_spot_compactor = None
+_spot_compactor_lock = threading.Lock()
+_spot_compact_wakeup = threading.Event()
+# Journal overlay on the cached workbook: (workbook frame, records list, records
+# applied, overlay frame), and the last step that extended it (parent, overlay,
+# changed positions, patched columns)
+_journal_overlay = None
+_journal_overlay_step = None
+_spot_journal_stats = {
+    "appends": 0,
+    "patches": 0,
+    "compacted_rows": 0,
+    "compacted_patches": 0
+}
+
+def _read_spot_journal():
+    """Parse the journal file; a torn last line (crash mid-append) is skipped"""
+    records = []
+    if not os.path.exists(SPOT_JOURNAL_PATH):
+        return records
+    with open(SPOT_JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"DEBUG: Skipping unreadable journal line: {line[:80]}")
+    return records
+
+def load_spot_journal(refresh=True):
+    """
+    Pending journal records, cached until this or another worker appends or compacts.
+    refresh=False skips the on-disk check, for callers still serving a pre-compaction workbook.
+    """
+    global _spot_journal_cache, _spot_journal_keys
+
+    if refresh or _spot_journal_cache is None:
+        _check_file_resource("journal", SPOT_JOURNAL_PATH)
+    with _cache_lock:
+        if _spot_journal_cache is not None:
+            return _spot_journal_cache
+        _spot_journal_cache = _read_spot_journal()
+        _spot_journal_keys = {normalize_reg_no(r.get("reg_no")) for r in _spot_journal_cache
+                              if r.get("op") == "append"}
+        _remember_file_signature("journal", SPOT_JOURNAL_PATH)
+        records = _spot_journal_cache
+    if records:
+        _ensure_spot_compactor()
+    return records
+
+def _journal_rows(records, known):
+    """Rows of the append records whose reg_no is not in known (first record wins)"""
+    rows = []
+    seen = set(known)
+    for record in records:
+        if record.get("op") != "append":
+            continue
+        reg_key = normalize_reg_no(record.get("reg_no"))
+        if not reg_key or reg_key in seen:
+            continue  # Already in the workbook (compacted or written back) or a duplicate
+        seen.add(reg_key)
+        rows.append((reg_key, record.get("row") or {}))
+    return rows
+
+def _patch_frame(df, mapping, reg_no, cells):
+    """Set cells ({column: value}) on reg_no's row of df in place; returns False if it isn't there"""
+    pos = find_registration_position(df, mapping, reg_no)
+    if pos is None:
+        return False
+    idx = df.index[pos]
+    for col, value in cells.items():
+        if col not in df.columns:
+            continue  # Not in this (projected) frame
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([value])
+        df.at[idx, col] = value
+    return True
+
+def _overlay_journal(base, records):
+    """
+    base with the journal's not-yet-compacted registrations appended and cell patches applied.
+    The overlay is kept and extended as records are appended: records it already holds
+    are skipped, so a new spot registration costs one concat of the new rows instead of
+    a rebuild from the workbook frame. Patches set cells in place, on the cached workbook
+    frame too while no rows are overlaid: that frame stands for the workbook, and the
+    patch is folded into the file it is re-read from after compaction.
+    """
+    global _journal_overlay, _journal_overlay_step
+
+    mapping = load_column_map() or {}
+    with _cache_lock:
+        state = _journal_overlay
+        if state is not None and state[0] is base and state[1] is records and state[2] <= len(records):
+            parent, start = state[3], state[2]
+        else:
+            parent, start = base, 0  # New workbook frame or re-read journal: start over
+        new = records[start:]
+        if not new:
+            return parent
+
+        parent_index = get_reg_index(parent, mapping)
+        rows = _journal_rows(new, parent_index)
+        patches = [record for record in new if record.get("op") == "patch"]
+        df = parent
+        if rows:
+            extra = pd.DataFrame([row for _, row in rows]).reindex(columns=parent.columns)
+            schema = get_ingest_schema()
+            if schema is not None:
+                extra = schema.apply_dtypes(extra)
+            df = pd.concat([parent, extra], ignore_index=True)
+            for col in parent.columns:
+                if isinstance(parent[col].dtype, pd.CategoricalDtype) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype("category")
+
+        # Extend the parent's index instead of rescanning the merged frame
+        reg_col = mapping.get("reg_no")
+        if df is not parent and reg_col in df.columns:
+            index = dict(parent_index)
+            for offset, (reg_key, _) in enumerate(rows):
+                index[reg_key] = len(parent) + offset
+            _seed_reg_index(df, reg_col, index)
+
+        positions = set(range(len(parent), len(df)))
+        columns = set()
+        for record in patches:
+            cells = record.get("cells") or {}
+            if _patch_frame(df, mapping, record.get("reg_no"), cells):
+                positions.add(find_registration_position(df, mapping, record.get("reg_no")))
+                columns.update(cells)
+        # Rows of df that differ from parent, for views that update instead of rebuilding
+        _journal_overlay_step = (parent, df, positions, columns)
+        _journal_overlay = (base, records, start + len(new), df)
+        return df
+
+def journal_overlay_step(df):
+    """(parent frame, changed row positions, patched columns) if df is the overlay extended from parent, else None"""
+    step = _journal_overlay_step
+    if step is None or step[1] is not df:
+        return None
+    return step[0], step[2], step[3]
+
+def registration_exists(reg_no):
+    """
+    O(1) uniqueness check: the workbook's reg_no index plus the journal's pending appends.
+    Both sets persist across calls; the index is rebuilt only when the workbook changes
+    (upload, compaction) and the journal set is extended on every append.
+    """
+    reg_key = normalize_reg_no(reg_no)
+    if not reg_key:
+        return False
+    records = load_spot_journal()
+    if records and reg_key in (_spot_journal_keys or ()):
+        return True
+    return reg_key in get_reg_index(_load_workbook_frame(), load_column_map())
+
+def append_spot_registration(reg_no, row):
+    """
+    Durably append a spot registration to the journal.
+    Returns False if reg_no is already registered or pending in the journal.
+    """
+    record = {"op": "append", "reg_no": reg_no, "row": row, "ts": time.time()}
+    os.makedirs(os.path.dirname(SPOT_JOURNAL_PATH), exist_ok=True)
+    with portalocker.Lock(SPOT_JOURNAL_LOCK_PATH, 'w', timeout=5):
+        # Re-check under the lock: another worker may have appended since our view was built
+        if _file_signature(SPOT_JOURNAL_PATH) != _file_signatures.get("journal", (None,))[0]:
+            invalidate_resource("journal")
+        if registration_exists(reg_no):
+            return False
+        pending = _append_journal_locked(record, load_spot_journal())
+
+    _ensure_spot_compactor()
+    if pending >= SPOT_JOURNAL_COMPACT_ROWS:
+        _spot_compact_wakeup.set()
+    return True
+
+def append_journal_patch(reg_no, cells):
+    """Durably journal a cell patch ({column: value}) for reg_no, to be folded in at compaction"""
+    record = {"op": "patch", "reg_no": reg_no, "cells": cells, "ts": time.time()}
+    os.makedirs(os.path.dirname(SPOT_JOURNAL_PATH), exist_ok=True)
+    with portalocker.Lock(SPOT_JOURNAL_LOCK_PATH, 'w', timeout=5):
+        if _file_signature(SPOT_JOURNAL_PATH) != _file_signatures.get("journal", (None,))[0]:
+            invalidate_resource("journal")
+        pending = _append_journal_locked(record, load_spot_journal())
+
+    _ensure_spot_compactor()
+    if pending >= SPOT_JOURNAL_COMPACT_ROWS:
+        _spot_compact_wakeup.set()
+
+def _append_journal_locked(record, records):
+    """Write one record and add it to the cached records; caller holds the journal lock"""
+    line = json.dumps(record, default=str) + "\n"
+    with open(SPOT_JOURNAL_PATH, "a+b") as f:
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line  # Terminate a torn line left by a crash mid-append
+        f.write(line.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+    with _cache_lock:
+        if _spot_journal_cache is records:
+            records.append(record)
+            if record["op"] == "append":
+                _spot_journal_keys.add(normalize_reg_no(record["reg_no"]))
+            if _spot_journal_rosters is not None:
+                _journal_roster_update(record, load_column_map() or {},
+                                       _spot_journal_rosters, _spot_journal_dirty)
+            _bump_generation("journal")
+        else:
+            _invalidate_locked(("journal",))
+        _remember_file_signature("journal", SPOT_JOURNAL_PATH)
+        _spot_journal_stats["appends" if record["op"] == "append" else "patches"] += 1
+        pending = len(records)
+
+    if record["op"] == "patch":
+        # A patched team, college or contact shows up in that event's roster, if the team reported
+        reg_no = canonical_reg_no(record["reg_no"])
+        entry = (_status_cache or {}).get(reg_no, {})
+        if entry.get("reported") and entry.get("event"):
+            notify_roster_feed({entry["event"]: {reg_no}})
+    return pending
+
+def _trim_spot_journal(consumed):
+    """Remove the first `consumed` bytes of the journal; caller holds the journal lock"""
+    with open(SPOT_JOURNAL_PATH, "rb") as f:
+        f.seek(consumed)
+        remainder = f.read()
+    tmp_path = SPOT_JOURNAL_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(remainder)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SPOT_JOURNAL_PATH)
+
+def compact_spot_journal():
+    """
+    Fold journaled spot registrations into registrations.xlsx through the workbook writer.
+    Returns the number of rows written to the workbook.
+    """
+    if not os.path.exists(SPOT_JOURNAL_PATH) or os.path.getsize(SPOT_JOURNAL_PATH) == 0:
+        return 0
+    try:
+        return submit_workbook_job("compact").result(WORKBOOK_EDIT_TIMEOUT)
+    except Exception as e:
+        print(f"ERROR: Spot journal compaction failed: {e}")
+        return 0
+
+def _spot_compactor_loop():
+    while True:
+        _spot_compact_wakeup.wait(SPOT_JOURNAL_COMPACT_INTERVAL)
+        _spot_compact_wakeup.clear()
+        if len(load_spot_journal()) >= SPOT_JOURNAL_COMPACT_ROWS:
+            compact_spot_journal()
+
+def _ensure_spot_compactor():
+    global _spot_compactor
+    with _spot_compactor_lock:
+        if _spot_compactor is None or not _spot_compactor.is_alive():
+            _spot_compactor = threading.Thread(target=_spot_compactor_loop, name="spot-compactor", daemon=True)
+            _spot_compactor.start()
+
+def get_spot_journal_stats():
+    with _cache_lock:
+        stats = dict(_spot_journal_stats)
+    stats["pending"] = len(load_spot_journal())
+    return stats
+
+# ---------------- WORKBOOK WRITER ---------------- #
+
+# Every registrations.xlsx mutation goes through one writer thread per worker.
+# Jobs queued within WORKBOOK_WRITE_WINDOW seconds are applied to a single read
+# of the workbook and written once (temp file + os.replace) under the workbook
+# lock file, which serializes the writers of different gunicorn workers. Each
+# write also folds in the spot registration journal. Callers get a Future.
+EXCEL_LOCK_PATH = EXCEL_PATH + ".lock"
+WORKBOOK_WRITE_WINDOW = 0.05  # Seconds to gather concurrent edits into one write
+WORKBOOK_LOCK_TIMEOUT = 30  # Seconds to wait for another worker's write
+WORKBOOK_EDIT_TIMEOUT = 120  # Seconds a caller waits for its edit to be written
+# How single-row edits (college, team) reach the xlsx: "deferred", "cell" or "rewrite"
+WORKBOOK_PATCH_MODE = os.environ.get("WORKBOOK_PATCH_MODE", "deferred")
+_workbook_queue = queue.Queue()
+_workbook_writer = None
+_workbook_writer_lock = threading.Lock()
+_workbook_write_stats = {
+    "writes": 0,
+    "jobs": 0,
+    "failed_jobs": 0,
+    "max_batch": 0,
+    "last_batch": 0,
+    "last_write_ms": 0.0,
+    "total_write_ms": 0.0
+}
+
+def submit_workbook_job(kind, edit=None, path=None, patch=None):
+    """
+    Queue a workbook job and return its Future.
+    kind "edit": edit(df, mapping) is applied to the full workbook; its return value is the result.
+    kind "patch": patch=(reg_no, {column: value}) is written to those cells only.
+    kind "compact": only fold the spot journal in; the result is the number of rows folded.
+    kind "replace": install the xlsx at path as the new workbook; the result is the backup path.
+    """
+    job = {"kind": kind, "edit": edit, "path": path, "patch": patch, "future": Future()}
+    _ensure_workbook_writer()
+    _workbook_queue.put(job)
+    return job["future"]
+
+def edit_workbook(edit):
+    """Apply edit(df, mapping) to registrations.xlsx and return its result once written"""
+    return submit_workbook_job("edit", edit).result(WORKBOOK_EDIT_TIMEOUT)
+
+def patch_registration(reg_no, cells):
+    """
+    Set cells ({column: value}) on reg_no's workbook row, as WORKBOOK_PATCH_MODE says:
+    "deferred" journals the patch (visible at once, written at compaction), "cell"
+    writes just those cells now, "rewrite" rewrites the whole workbook now.
+    """
+    if WORKBOOK_PATCH_MODE == "deferred":
+        append_journal_patch(reg_no, cells)
+    elif WORKBOOK_PATCH_MODE == "cell":
+        submit_workbook_job("patch", patch=(reg_no, cells)).result(WORKBOOK_EDIT_TIMEOUT)
+    else:
+        def rewrite(df, mapping):
+            if not _patch_frame(df, mapping, reg_no, cells):
+                raise KeyError(f"Registration {reg_no} not found in workbook")
+        edit_workbook(rewrite)
+
+def _write_workbook_locked(jobs):
+    """Apply jobs and the pending journal to the workbook in one write; caller holds EXCEL_LOCK_PATH"""
+    with portalocker.Lock(SPOT_JOURNAL_LOCK_PATH, 'w', timeout=5):
+        raw = b""
+        if os.path.exists(SPOT_JOURNAL_PATH):
+            with open(SPOT_JOURNAL_PATH, "rb") as f:
+                raw = f.read()
+    consumed = raw.rfind(b"\n") + 1  # Leave a torn trailing line for the next pass
+    records = []
+    for line in raw[:consumed].decode("utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+
+    mapping = load_column_map() or {}
+    if any(job["kind"] == "edit" for job in jobs):
+        results, folded = _rewrite_workbook(jobs, records, mapping)
+    else:
+        results, folded = _patch_workbook(jobs, records, mapping)
+
+    if consumed:
+        with portalocker.Lock(SPOT_JOURNAL_LOCK_PATH, 'w', timeout=5):
+            _trim_spot_journal(consumed)
+    with _cache_lock:
+        _spot_journal_stats["compacted_rows"] += folded
+        _spot_journal_stats["compacted_patches"] += sum(1 for r in records if r.get("op") == "patch")
+    return results
+
+def _rewrite_workbook(jobs, records, mapping):
+    """Full rewrite through pandas, needed when a job edits the DataFrame"""
+    df = pd.read_excel(EXCEL_PATH)
+    rows = _journal_rows(records, get_reg_index(df, mapping))
+    if rows:
+        df = pd.concat([df, pd.DataFrame([row for _, row in rows]).reindex(columns=df.columns)],
+                       ignore_index=True)
+    for record in records:
+        if record.get("op") == "patch":
+            _patch_frame(df, mapping, record.get("reg_no"), record.get("cells") or {})
+
+    results = []
+    for job in jobs:
+        try:
+            if job["kind"] == "edit":
+                results.append((job, job["edit"](df, mapping), None))
+            elif job["kind"] == "patch":
+                if not _patch_frame(df, mapping, *job["patch"]):
+                    raise KeyError(f"Registration {job['patch'][0]} not found in workbook")
+                results.append((job, True, None))
+            else:
+                results.append((job, len(rows), None))
+        except Exception as e:
+            results.append((job, None, e))  # Fails only this caller's edit
+
+    tmp_path = EXCEL_PATH + ".write.tmp.xlsx"
+    with pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Sheet1')
+    os.replace(tmp_path, EXCEL_PATH)
+    return results, len(rows)
+
+def _patch_workbook(jobs, records, mapping):
+    """
+    Append journal rows and set patched cells with openpyxl, leaving every other cell as it is.
+    Rows are located through the cached reg_no index and verified against the sheet.
+    openpyxl still loads and saves the whole file (the whole sheet in memory, see
+    SPOT_JOURNAL_COMPACT_ROWS), but skips pandas' parse and re-serialization.
+    """
+    reg_col = mapping.get("reg_no")
+    results = []
+    if not any(job["kind"] == "patch" for job in jobs) and not records:
+        return [(job, 0, None) for job in jobs], 0
+
+    wb = openpyxl.load_workbook(EXCEL_PATH)
+    ws = wb.worksheets[0]
+    header = _header_names([cell.value for cell in ws[1]])
+    columns = {name: i + 1 for i, name in enumerate(header)}
+    reg_pos = columns.get(reg_col)
+
+    # Row of each reg_no: the cached frame's index is trusted when the sheet agrees,
+    # otherwise (or once rows are appended) the reg_no column is scanned once
+    cached_index = get_reg_index(_excel_cache, mapping) if _excel_cache is not None else {}
+    sheet_rows = None
+
+    def scan_rows():
+        nonlocal sheet_rows
+        if sheet_rows is None:
+            sheet_rows = {}
+            if reg_pos is not None:
+                for r, (value,) in enumerate(ws.iter_rows(min_row=2, min_col=reg_pos, max_col=reg_pos,
+                                                           values_only=True), start=2):
+                    sheet_rows.setdefault(normalize_reg_no(value), r)
+        return sheet_rows
+
+    def find_row(reg_no):
+        reg_key = normalize_reg_no(reg_no)
+        if not reg_key or reg_pos is None:
+            return None
+        if sheet_rows is None:
+            pos = cached_index.get(reg_key)
+            if pos is not None and normalize_reg_no(ws.cell(pos + 2, reg_pos).value) == reg_key:
+                return pos + 2
+        return scan_rows().get(reg_key)
+
+    def set_cells(row, cells):
+        for col, value in cells.items():
+            if col in columns:
+                ws.cell(row, columns[col]).value = None if value == "" else value
+
+    folded = 0
+    for record in records:
+        if record.get("op") == "append":
+            reg_key = normalize_reg_no(record.get("reg_no"))
+            if not reg_key or reg_key in scan_rows():
+                continue  # Already in the workbook
+            row = record.get("row") or {}
+            ws.append([None if row.get(name) == "" else row.get(name) for name in header])
+            sheet_rows[reg_key] = ws.max_row
+            folded += 1
+        elif record.get("op") == "patch":
+            row = find_row(record.get("reg_no"))
+            if row is not None:
+                set_cells(row, record.get("cells") or {})
+
+    for job in jobs:
+        if job["kind"] == "patch":
+            reg_no, cells = job["patch"]
+            row = find_row(reg_no)
+            if row is None:
+                results.append((job, None, KeyError(f"Registration {reg_no} not found in workbook")))
+                continue
+            set_cells(row, cells)
+            results.append((job, True, None))
+        else:
+            results.append((job, folded, None))
+
+    tmp_path = EXCEL_PATH + ".write.tmp.xlsx"
+    wb.save(tmp_path)
+    wb.close()
+    os.replace(tmp_path, EXCEL_PATH)
+    return results, folded
+
+def _replace_workbook_locked(path):
+    """Back up the current workbook and install the one at path; caller holds EXCEL_LOCK_PATH"""
+    backup_path = None
+    if os.path.exists(EXCEL_PATH):
+        # Fold pending spot registrations and cell patches in first so the backup has
+        # them; if that fails the replace fails too and the journal is left alone.
+        # The fold trims only the bytes it read: spot registrations acknowledged after
+        # that stay journaled and are overlaid on (then compacted into) the new workbook.
+        if os.path.exists(SPOT_JOURNAL_PATH) and os.path.getsize(SPOT_JOURNAL_PATH) > 0:
+            _write_workbook_locked([])
+        backup_path = os.path.join(os.path.dirname(EXCEL_PATH),
+                                   f"registrations_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+        shutil.copy2(EXCEL_PATH, backup_path)
+    os.replace(path, EXCEL_PATH)
+    return backup_path
+
+def _run_workbook_batch(batch):
+    """Run a batch of jobs under the workbook lock, resolving every job's Future"""
+    started = time.perf_counter()
+    outcomes = []
+    try:
+        with portalocker.Lock(EXCEL_LOCK_PATH, 'w', timeout=WORKBOOK_LOCK_TIMEOUT):
+            pending = []
+            for job in batch:
+                if job["kind"] != "replace":
+                    pending.append(job)
+                    continue
+                # Edits queued ahead of a replace land in the backup, in order
+                if pending:
+                    outcomes.extend(_write_workbook_locked(pending))
+                    pending = []
+                try:
+                    outcomes.append((job, _replace_workbook_locked(job["path"]), None))
+                except Exception as e:
+                    outcomes.append((job, None, e))
+            if pending:
+                outcomes.extend(_write_workbook_locked(pending))
+    except Exception as e:
+        print(f"ERROR: Workbook write failed: {e}")
+        # Jobs of runs that were written keep their outcome; the rest fail
+        finished = {id(job) for job, _, _ in outcomes}
+        outcomes += [(job, None, e) for job in batch if id(job) not in finished]
+    finally:
+        invalidate_resource("workbook", "journal")
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _cache_lock:
+        _workbook_write_stats["writes"] += 1
+        _workbook_write_stats["jobs"] += len(batch)
+        _workbook_write_stats["failed_jobs"] += sum(1 for _, _, error in outcomes if error is not None)
+        _workbook_write_stats["last_batch"] = len(batch)
+        _workbook_write_stats["max_batch"] = max(_workbook_write_stats["max_batch"], len(batch))
+        _workbook_write_stats["last_write_ms"] = round(elapsed_ms, 2)
+        _workbook_write_stats["total_write_ms"] += elapsed_ms
+
+    for job, result, error in outcomes:
+        if error is not None:
+            job["future"].set_exception(error)
+        else:
+            job["future"].set_result(result)
+
+def _workbook_writer_loop():
+    running = True
+    while running:
+        first = _workbook_queue.get()
+        if first is None:
+            break
+        batch = [first]
+        deadline = time.monotonic() + WORKBOOK_WRITE_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    job = _workbook_queue.get(timeout=remaining)
+                else:
+                    job = _workbook_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                running = False  # Shutting down: write what we have, then stop
+                break
+            batch.append(job)
+        _run_workbook_batch(batch)
+
+def _ensure_workbook_writer():
+    global _workbook_writer
+    with _workbook_writer_lock:
+        if _workbook_writer is None or not _workbook_writer.is_alive():
+            _workbook_writer = threading.Thread(target=_workbook_writer_loop, name="workbook-writer", daemon=True)
+            _workbook_writer.start()
+
+def flush_workbook_writes(timeout=30):
+    """Stop the writer after it has written every queued job (called at shutdown)"""
+    global _workbook_writer
+    with _workbook_writer_lock:
+        writer = _workbook_writer
+        _workbook_writer = None
+    if writer is not None and writer.is_alive():
+        _workbook_queue.put(None)
+        writer.join(timeout)
+
+atexit.register(flush_workbook_writes)
+
+def get_workbook_write_stats():
+    with _cache_lock:
+        stats = dict(_workbook_write_stats)
+    writes = stats["writes"] or 1
+    stats["avg_batch"] = round(stats["jobs"] / writes, 2)
+    stats["avg_write_ms"] = round(stats.pop("total_write_ms") / writes, 2)
+    stats["queued"] = _workbook_queue.qsize()
+    return stats
+
+# ---------------- STATUS STORE ---------------- #
+
+# Status lives in SQLite (WAL mode), one row per registration. The indexed
+# columns mirror the keys the routes filter on; the full entry is kept as JSON
+# in `data` so any other keys (team_override, college, ...) round-trip as before.
+_status_db_local = threading.local()
+_status_lock = threading.RLock()
+_status_seen_seq = 0  # Last status_log entry reflected in _status_cache
+_status_synced_at = 0.0
+STATUS_LOG_RETENTION = 10000  # status_log rows kept for incremental syncs
+
+STATUS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS status (
+    reg_no TEXT PRIMARY KEY,
+    event TEXT,
+    reported INTEGER NOT NULL DEFAULT 0,
+    event_started INTEGER NOT NULL DEFAULT 0,
+    event_ended INTEGER NOT NULL DEFAULT 0,
+    position INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_status_event ON status(event);
+CREATE INDEX IF NOT EXISTS idx_status_reported ON status(reported);
+CREATE INDEX IF NOT EXISTS idx_status_event_started ON status(event_started);
+CREATE INDEX IF NOT EXISTS idx_status_event_ended ON status(event_ended);
+CREATE INDEX IF NOT EXISTS idx_status_position ON status(position);
+CREATE TABLE IF NOT EXISTS status_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS status_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    reg_no TEXT
+);
+CREATE TABLE IF NOT EXISTS reg_allocator (
+    prefix TEXT PRIMARY KEY,
+    high_water INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reg_reservations (
+    reg_no TEXT PRIMARY KEY,
+    desk TEXT NOT NULL,
+    reserved_at REAL NOT NULL
+);
+"""
+
+def _status_db():
+    """Per-thread SQLite connection to the status database"""
+    conn = getattr(_status_db_local, "conn", None)
+    if conn is not None and getattr(_status_db_local, "path", None) == STATUS_DB_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(STATUS_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(STATUS_DB_PATH, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(STATUS_SCHEMA)
+    _status_db_local.conn = conn
+    _status_db_local.path = STATUS_DB_PATH
+    migrate_status_json(conn)
+    return conn
+
+def _status_row(reg_no, entry):
+    """Row tuple for the status table"""
+    return (
+        reg_no,
+        entry.get("event"),
+        1 if entry.get("reported") else 0,
+        1 if entry.get("event_started") else 0,
+        1 if entry.get("event_ended") else 0,
+        entry.get("position"),
+        json.dumps(entry)
+    )
+
+def _write_status_rows(conn, changes):
+    """Upsert or delete status rows; changes maps reg_no -> entry (None deletes)"""
+    upserts = [_status_row(reg_no, entry) for reg_no, entry in changes.items() if entry is not None]
+    deletes = [(reg_no,) for reg_no, entry in changes.items() if entry is None]
+    if upserts:
+        conn.executemany(
+            "INSERT INTO status (reg_no, event, reported, event_started, event_ended, position, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(reg_no) DO UPDATE SET event=excluded.event, reported=excluded.reported, "
+            "event_started=excluded.event_started, event_ended=excluded.event_ended, "
+            "position=excluded.position, data=excluded.data",
+            upserts
+        )
+    if deletes:
+        conn.executemany("DELETE FROM status WHERE reg_no = ?", deletes)
+
+def migrate_status_json(conn=None, json_path=None):
+    """
+    One-shot import of the legacy status.json into the status database.
+    Runs once per database; later calls are no-ops.
+    """
+    conn = conn or _status_db()
+    json_path = json_path or STATUS_PATH
+
+    if conn.execute("SELECT 1 FROM status_meta WHERE key = 'json_migrated'").fetchone():
+        return 0
+
+    data = {}
+    if os.path.exists(json_path):
+        try:
+            with open(json_path, "r") as f:
+                content = f.read().strip()
+                data = json.loads(content) if content else {}
+        except json.JSONDecodeError as e:
+            print(f"ERROR: status.json is not valid JSON, skipping migration: {e}")
+            data = {}
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another worker may have migrated while we waited for the write lock
+        if conn.execute("SELECT 1 FROM status_meta WHERE key = 'json_migrated'").fetchone():
+            conn.execute("ROLLBACK")
+            return 0
+        _write_status_rows(conn, data)
+        conn.execute(
+            "INSERT INTO status_meta (key, value) VALUES ('json_migrated', ?)",
+            (datetime.now().isoformat(),)
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    print(f"Migrated {len(data)} status entries from {json_path} to {STATUS_DB_PATH}")
+    return len(data)
+
+def export_status_json(path=None):
+    """Write the status database back out in the legacy status.json format"""
+    path = path or STATUS_PATH
+    data = {
+        reg_no: json.loads(entry)
+        for reg_no, entry in _status_db().execute("SELECT reg_no, data FROM status ORDER BY rowid")
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with portalocker.Lock(path, 'w', timeout=10) as f:
+        json.dump(data, f, indent=4)
+    return data
+
+# Secondary indexes over status, kept in step with every status write so
+# event-scoped routes cost O(teams in event) instead of O(all registrations)
+_status_event_index = {}  # event -> {reg_no: None} (insertion-ordered set)
+_status_event_flags = {}  # event -> {"started": count, "ended": count, "reported": count}
+_status_event_positions = {}  # event -> {reg_no: position} for entries with a position
+_status_team_overrides = {}  # reg_no -> normalized team_override tuple (non-empty only)
+_status_winners = {}  # reg_no -> (event, position) for ended entries with a position
+_leaderboard_pending = set()  # Winner reg_nos changed since the leaderboard last caught up (None = rebuild)
+_dashboard_pending = set()  # Events whose status changed since the dashboard view caught up (None = rebuild)
+
+def _index_status_entry(reg_no, entry, delta):
+    """Add (delta=1) or remove (delta=-1) one status entry from the secondary indexes"""
+    override = entry.get("team_override")
+    if delta < 0:
+        _status_team_overrides.pop(reg_no, None)
+    elif isinstance(override, list):
+        team = normalize_team(override)
+        if team:
+            _status_team_overrides[reg_no] = tuple(team)
+
+    event = entry.get("event")
+    if not event:
+        return
+
+    regs = _status_event_index.setdefault(event, {})
+    flags = _status_event_flags.setdefault(event, {"started": 0, "ended": 0, "reported": 0})
+    if delta > 0:
+        regs[reg_no] = None
+    else:
+        regs.pop(reg_no, None)
+    if entry.get("event_started"):
+        flags["started"] += delta
+    if entry.get("event_ended"):
+        flags["ended"] += delta
+    if entry.get("reported"):
+        flags["reported"] += delta
+    if "position" in entry:
+        positions = _status_event_positions.setdefault(event, {})
+        if delta > 0:
+            positions[reg_no] = entry["position"]
+        else:
+            positions.pop(reg_no, None)
+        if not positions:
+            _status_event_positions.pop(event, None)
+    _dashboard_pending.add(event)
+
+    if not regs:
+        _status_event_index.pop(event, None)
+        _status_event_flags.pop(event, None)
+
+    if entry.get("event_ended") and "position" in entry:
+        if delta > 0:
+            _status_winners[reg_no] = (event, entry["position"])
+        else:
+            _status_winners.pop(reg_no, None)
+        _leaderboard_pending.add(reg_no)
+
+def _rebuild_status_indexes(status):
+    notify_roster_feed(None)
+    _status_event_index.clear()
+    _status_event_flags.clear()
+    _status_team_overrides.clear()
+    _status_event_positions.clear()
+    _status_winners.clear()
+    _leaderboard_pending.clear()
+    _leaderboard_pending.add(None)
+    _dashboard_pending.clear()
+    _dashboard_pending.add(None)
+    for reg_no, entry in status.items():
+        _index_status_entry(reg_no, entry, 1)
+
 def load_status():
-    """Load status with caching"""
-    global _status_cache
+    """Load status with caching (treat the returned dict as read-only, write through update_status)"""
+    global _status_cache, _status_seen_seq, _status_synced_at
     
     if _status_cache is not None:
+        # Pick up other workers' commits at most COHERENCE_INTERVAL seconds late
+        if time.monotonic() - _status_synced_at >= COHERENCE_INTERVAL:
+            _sync_status()
         return _status_cache
     
-    if not os.path.exists(STATUS_PATH):
-        with open(STATUS_PATH, "w") as f:
-            json.dump({}, f)
-        _status_cache = {}
-        return _status_cache
-    
-    with open(STATUS_PATH, "r") as f:
-        _status_cache = json.load(f)
+    with _status_lock:
+        if _status_cache is None:
+            conn = _status_db()
+            conn.execute("BEGIN")
+            try:
+                seen_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM status_log").fetchone()[0]
+                rows = conn.execute("SELECT reg_no, data FROM status ORDER BY rowid").fetchall()
+            finally:
+                conn.execute("COMMIT")
+            status = {reg_no: json.loads(entry) for reg_no, entry in rows}
+            _rebuild_status_indexes(status)
+            _status_seen_seq = seen_seq
+            _status_synced_at = time.monotonic()
+            _status_cache = status
     
     return _status_cache
 
-def invalidate_cache():
-    """Invalidate all caches when data is modified"""
-    global _excel_cache, _excel_cache_time, _column_map_cache, _status_cache
-    _excel_cache = None
-    _excel_cache_time = None
-    _column_map_cache = None
-    _status_cache = None
-    print("DEBUG: Cache invalidated")
+def _sync_status():
+    """
+    Apply status rows committed by other workers since the last sync.
+    Every commit appends the reg_nos it touched to status_log, so a sync only
+    re-reads those rows; a replace (or a log pruned past our position) reloads everything.
+    """
+    global _status_cache, _status_seen_seq, _status_synced_at
 
-def save_status(data):
-    """Save status data to JSON file with proper error handling"""
+    with _status_lock:
+        _status_synced_at = time.monotonic()
+        if _status_cache is None:
+            return
+
+        conn = _status_db()
+        conn.execute("BEGIN")
+        try:
+            log = conn.execute(
+                "SELECT seq, reg_no FROM status_log WHERE seq > ? ORDER BY seq", (_status_seen_seq,)
+            ).fetchall()
+            if not log:
+                return
+            full_reload = log[0][0] != _status_seen_seq + 1 or any(reg_no is None for _, reg_no in log)
+            rows = {}
+            if not full_reload:
+                reg_nos = list(dict.fromkeys(reg_no for _, reg_no in log))
+                for i in range(0, len(reg_nos), 500):
+                    chunk = reg_nos[i:i + 500]
+                    rows.update(conn.execute(
+                        f"SELECT reg_no, data FROM status WHERE reg_no IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall())
+        finally:
+            conn.execute("COMMIT")
+
+        if full_reload:
+            print("DEBUG: Status changed in another worker, reloading")
+            _status_cache = None
+            _bump_generation("status")
+            load_status()
+            return
+
+        changes = {reg_no: (json.loads(rows[reg_no]) if reg_no in rows else None) for reg_no in reg_nos}
+        _status_cache = _apply_status_changes(_status_cache, changes)
+        _status_seen_seq = log[-1][0]
+        _bump_generation("status")
+
+def status_regs_for_event(event):
+    """Registration numbers that have a status entry for this event"""
+    load_status()
+    return list(_status_event_index.get(event, ()))
+
+def event_is_started(event):
+    """Whether any registration of event has event_started set (enabled by the desk or started)"""
+    load_status()
+    return _status_event_flags.get(event, {}).get("started", 0) > 0
+
+def event_is_ended(event):
+    load_status()
+    return _status_event_flags.get(event, {}).get("ended", 0) > 0
+
+def _apply_status_changes(status, changes):
+    """New status dict with entries replaced (or deleted when None), indexes updated to match"""
+    status = dict(status)
+    touched = {}  # event -> reg_nos changed on its roster (reported before or after the change)
+    for reg_no, entry in changes.items():
+        old = status.pop(reg_no, None) if entry is None else status.get(reg_no)
+        if old is not None:
+            _index_status_entry(reg_no, old, -1)
+            if old.get("reported"):
+                touched.setdefault(old.get("event"), set()).add(reg_no)
+        if entry is not None:
+            status[reg_no] = entry
+            _index_status_entry(reg_no, entry, 1)
+            if entry.get("reported"):
+                touched.setdefault(entry.get("event"), set()).add(reg_no)
+    touched.pop(None, None)
+    if touched:
+        notify_roster_feed(touched)
+    return status
+
+def _merge_status_fields(conn, ops):
+    """
+    Merge field updates into the rows as they are in the database right now,
+    inside the write transaction, so concurrent workers never drop each other's keys.
+    ops is a list of (changes, remove) pairs applied in order.
+    """
+    reg_nos = list(dict.fromkeys(reg_no for changes, remove in ops for reg_no in (*changes, *remove)))
+    current = {}
+    for i in range(0, len(reg_nos), 500):
+        chunk = reg_nos[i:i + 500]
+        current.update(conn.execute(
+            f"SELECT reg_no, data FROM status WHERE reg_no IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+
+    merged = {reg_no: json.loads(entry) for reg_no, entry in current.items()}
+    for changes, remove in ops:
+        for reg_no, fields in changes.items():
+            merged.setdefault(reg_no, {}).update(fields)
+        for reg_no, keys in remove.items():
+            # Nothing to remove keys from if the entry doesn't exist
+            for key in keys if reg_no in merged else ():
+                merged[reg_no].pop(key, None)
+    return merged
+
+def _commit_status(ops=(), replace=None):
+    """
+    Apply status changes in one SQLite transaction and mirror them into the cache.
+    ops is a list of (changes, remove) patches; replace is a dict that replaces the whole table.
+    """
+    global _status_cache, _status_seen_seq
+
+    with _status_lock:
+        status = load_status()
+        conn = _status_db()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if replace is not None:
+                    conn.execute("DELETE FROM status")
+                    merged = dict(replace)
+                    log_rows = [(None,)]  # NULL reg_no marks a full replace
+                else:
+                    merged = _merge_status_fields(conn, ops)
+                    log_rows = [(reg_no,) for reg_no in merged]
+                _write_status_rows(conn, merged)
+                conn.executemany("INSERT INTO status_log (reg_no) VALUES (?)", log_rows)
+                last_seq = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                # Keep the log bounded; workers that fall further behind do a full reload
+                conn.execute("DELETE FROM status_log WHERE seq <= ?", (last_seq - STATUS_LOG_RETENTION,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            print(f"Lock error saving status: {e}")
+            raise Exception(f"Status database is locked: {str(e)}")
+        except Exception as e:
+            print(f"Unexpected error saving status: {e}")
+            import traceback
+            traceback.print_exc()
+            raise Exception(f"Failed to save status: {str(e)}")
+
+        # Swap in a new dict so readers holding the old one see a consistent view
+        if replace is not None:
+            status = dict(merged)
+            _rebuild_status_indexes(status)
+        else:
+            status = _apply_status_changes(status, merged)
+        # If nobody else committed since our last sync, our cache is now current
+        if last_seq - len(log_rows) == _status_seen_seq:
+            _status_seen_seq = last_seq
+        _status_cache = status
+        _bump_generation("status")
+
+# ---------------- REGISTRATION NUMBER ALLOCATOR ---------------- #
+
+# Spot registration numbers are handed out by a cursor kept in the status
+# database: each allocation continues after the last number it handed out and
+# wraps around at the end of the range, skipping numbers that are already in the
+# workbook or journal (typed in by hand, imported) or reserved by a desk. Typed
+# numbers never move the cursor, so gaps below them stay usable. BEGIN IMMEDIATE
+# serializes allocators across gunicorn workers. Desks can reserve a block to
+# hand out without a round trip each.
+REG_NO_PREFIX = "C26"
+REG_NO_DIGITS = 4
+REG_BLOCK_MAX = 100  # Largest block one reservation may take
+
+def allocate_reg_nos(count=1, desk=None):
+    """Atomically allocate count unused registration numbers, recording them against desk if given"""
+    conn = _status_db()
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(STATUS_PATH), exist_ok=True)
-        
-        # Save with file locking
-        with portalocker.Lock(STATUS_PATH, 'w', timeout=10) as f:
-            json.dump(data, f, indent=4)
-            
-        print(f"Successfully saved status data to {STATUS_PATH}")
-        
-    except portalocker.exceptions.LockException as e:
-        print(f"Lock error saving status: {e}")
-        raise Exception(f"File is locked: {str(e)}")
-    except PermissionError as e:
-        print(f"Permission error saving status: {e}")
-        raise Exception(f"Permission denied: {str(e)}")
+        row = conn.execute("SELECT high_water FROM reg_allocator WHERE prefix = ?", (REG_NO_PREFIX,)).fetchone()
+        cursor = row[0] if row else 0
+        reserved = {reg_no for reg_no, in conn.execute("SELECT reg_no FROM reg_reservations")}
+        last = 10 ** REG_NO_DIGITS - 1
+        allocated = []
+        number = cursor
+        for _ in range(last):
+            number = number % last + 1  # 1..last, wrapping after last
+            reg_no = f"{REG_NO_PREFIX}{number:0{REG_NO_DIGITS}d}"
+            if reg_no not in reserved and not registration_exists(reg_no):
+                allocated.append(reg_no)
+                if len(allocated) == count:
+                    break
+        if len(allocated) < count:
+            raise Exception(f"No {REG_NO_PREFIX} registration numbers left")
+        conn.execute(
+            "INSERT INTO reg_allocator (prefix, high_water) VALUES (?, ?) "
+            "ON CONFLICT(prefix) DO UPDATE SET high_water = excluded.high_water",
+            (REG_NO_PREFIX, number))
+        if desk:
+            now = time.time()
+            conn.executemany("INSERT OR REPLACE INTO reg_reservations (reg_no, desk, reserved_at) VALUES (?, ?, ?)",
+                             [(reg_no, desk, now) for reg_no in allocated])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    print(f"DEBUG: Allocated {allocated[0]}..{allocated[-1]} ({count}){f' for {desk}' if desk else ''}")
+    return allocated
+
+# ---------------- STATUS GROUP COMMIT ---------------- #
+
+# Status mutations arriving within STATUS_GROUP_COMMIT_WINDOW seconds of each
+# other are written in one transaction by a background committer thread. Each
+# caller still blocks until its own mutation is committed (or has failed).
+STATUS_GROUP_COMMIT_WINDOW = 0.05  # Seconds; 0 commits whatever is already queued
+_status_commit_queue = queue.Queue()
+_status_committer = None
+_status_committer_lock = threading.Lock()
+_status_commit_stats = {
+    "batches": 0,
+    "mutations": 0,
+    "max_batch": 0,
+    "last_batch": 0,
+    "failed_batches": 0,
+    "last_commit_ms": 0.0,
+    "total_commit_ms": 0.0,
+    "total_ack_ms": 0.0
+}
+
+def _commit_status_batch(batch):
+    """Commit a batch of queued mutations; retry one by one if the batch fails"""
+    started = time.perf_counter()
+    try:
+        _commit_status([(item["changes"], item["remove"]) for item in batch])
     except Exception as e:
-        print(f"Unexpected error saving status: {e}")
-        import traceback
-        traceback.print_exc()
-        raise Exception(f"Failed to save status: {str(e)}")
-    
-    # Invalidate cache when status is updated
-    invalidate_cache()
+        if len(batch) == 1:
+            batch[0]["error"] = e
+        else:
+            with _cache_lock:
+                _status_commit_stats["failed_batches"] += 1
+            # Isolate the mutation that broke the batch
+            for item in batch:
+                _commit_status_batch([item])
+            return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    now = time.perf_counter()
+    with _cache_lock:
+        _status_commit_stats["batches"] += 1
+        _status_commit_stats["mutations"] += len(batch)
+        _status_commit_stats["last_batch"] = len(batch)
+        _status_commit_stats["max_batch"] = max(_status_commit_stats["max_batch"], len(batch))
+        _status_commit_stats["last_commit_ms"] = round(elapsed_ms, 2)
+        _status_commit_stats["total_commit_ms"] += elapsed_ms
+        _status_commit_stats["total_ack_ms"] += sum((now - item["queued_at"]) * 1000 for item in batch)
+
+def _status_committer_loop():
+    running = True
+    while running:
+        first = _status_commit_queue.get()
+        if first is None:
+            break
+        batch = [first]
+        deadline = time.monotonic() + STATUS_GROUP_COMMIT_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = _status_commit_queue.get(timeout=remaining)
+                else:
+                    item = _status_commit_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                running = False  # Shutting down: commit what we have, then stop
+                break
+            batch.append(item)
+        try:
+            _commit_status_batch(batch)
+        except Exception as e:
+            for item in batch:
+                item["error"] = item["error"] or e
+        finally:
+            # Acknowledge every caller, committed or failed
+            for item in batch:
+                item["done"].set()
+
+def _ensure_status_committer():
+    global _status_committer
+    with _status_committer_lock:
+        if _status_committer is None or not _status_committer.is_alive():
+            _status_committer = threading.Thread(target=_status_committer_loop, name="status-committer", daemon=True)
+            _status_committer.start()
+
+def flush_status_commits(timeout=10):
+    """Stop the committer after it has written every queued mutation (called at shutdown)"""
+    global _status_committer
+    with _status_committer_lock:
+        committer = _status_committer
+        _status_committer = None
+    if committer is not None and committer.is_alive():
+        _status_commit_queue.put(None)
+        committer.join(timeout)
+
+atexit.register(flush_status_commits)
+
+def get_status_commit_stats():
+    with _cache_lock:
+        stats = dict(_status_commit_stats)
+    batches = stats["batches"] or 1
+    mutations = stats["mutations"] or 1
+    stats["avg_batch"] = round(stats["mutations"] / batches, 2)
+    stats["avg_commit_ms"] = round(stats.pop("total_commit_ms") / batches, 2)
+    stats["avg_ack_ms"] = round(stats.pop("total_ack_ms") / mutations, 2)
+    stats["queued"] = _status_commit_queue.qsize()
+    stats["window_ms"] = STATUS_GROUP_COMMIT_WINDOW * 1000
+    return stats
+
+def update_status(changes, remove=None):
+    """
+    Update status fields for the given registrations, returning once the change is committed.
+    changes maps reg_no -> {field: value} to set; remove maps reg_no -> [fields] to drop.
+    Fields not mentioned are left as they are in the database.
+    """
+    if not changes and not remove:
+        return
+
+    item = {
+        "changes": changes or {},
+        "remove": remove or {},
+        "done": threading.Event(),
+        "error": None,
+        "queued_at": time.perf_counter()
+    }
+    _ensure_status_committer()
+    _status_commit_queue.put(item)
+    item["done"].wait()
+    if item["error"] is not None:
+        raise item["error"]
+
+def save_status(data):
+    """Replace the whole status table with data"""
+    _commit_status(replace=data)
+    print(f"Successfully saved status data to {STATUS_DB_PATH}")
 
 def save_column_map(data):
     os.makedirs(os.path.dirname(COLUMN_MAP_PATH), exist_ok=True)
     with portalocker.Lock(COLUMN_MAP_PATH, 'w') as f:
         json.dump(data, f, indent=4)
-    # Invalidate cache when column map is updated
-    invalidate_cache()
+    # Only the column map (and views derived from it) is stale now
+    invalidate_resource("column_map")
+    _remember_file_signature("column_map", COLUMN_MAP_PATH)
 
 def load_event_codes():
+    """Load event codes with caching (returns a copy callers may modify)"""
+    global _event_codes_cache
+
+    _check_file_resource("event_codes", EVENT_CODES_PATH)
+    if _event_codes_cache is None:
+        _event_codes_cache = _read_event_codes()
+    return dict(_event_codes_cache)
+
+def _read_event_codes():
     # Load codes from file, or initialize with defaults
     # ... (rest of the code remains the same)
     if not os.path.exists(EVENT_CODES_PATH):
@@ -376,6 +2129,8 @@ def save_event_codes(data):
             json.dump(data, f, indent=4)
             
         print(f"Successfully saved {len(data)} event codes to {EVENT_CODES_PATH}")
+        invalidate_resource("event_codes")
+        _remember_file_signature("event_codes", EVENT_CODES_PATH)
         
     except portalocker.exceptions.LockException as e:
         print(f"Lock error saving event codes: {e}")
@@ -569,8 +2324,19 @@ def send_notification(message, phone_number=None):
 def save_event_ratings(data):
     with portalocker.Lock(EVENT_RATINGS_PATH, 'w') as f:
         json.dump(data, f, indent=4)
+    invalidate_resource("ratings")
+    _remember_file_signature("ratings", EVENT_RATINGS_PATH)
 
 def load_event_ratings():
+    """Load event ratings with caching (returns a copy callers may modify)"""
+    global _event_ratings_cache
+
+    _check_file_resource("ratings", EVENT_RATINGS_PATH)
+    if _event_ratings_cache is None:
+        _event_ratings_cache = _read_event_ratings()
+    return dict(_event_ratings_cache)
+
+def _read_event_ratings():
     """Load event ratings from JSON file"""
     if not os.path.exists(EVENT_RATINGS_PATH):
         # Return default ratings if file doesn't exist
@@ -582,6 +2348,25 @@ def load_event_ratings():
     except json.JSONDecodeError:
         return {}
 
+def load_colleges():
+    """Load custom colleges added through /add_college, with caching"""
+    global _colleges_cache
+
+    _check_file_resource("colleges", COLLEGES_PATH)
+    if _colleges_cache is None:
+        colleges = []
+        if os.path.exists(COLLEGES_PATH):
+            with open(COLLEGES_PATH, 'r') as f:
+                colleges = json.load(f)
+        _colleges_cache = colleges
+    return list(_colleges_cache)
+
+def save_colleges(colleges):
+    with open(COLLEGES_PATH, 'w') as f:
+        json.dump(colleges, f, indent=2)
+    invalidate_resource("colleges")
+    _remember_file_signature("colleges", COLLEGES_PATH)
+
 # Points system based on star rating
 POINTS_SYSTEM = {
     5: {"1st": 80, "2nd": 75, "3rd": 70},
@@ -591,76 +2376,893 @@ POINTS_SYSTEM = {
     1: {"1st": 60, "2nd": 55, "3rd": 50}
 }
 
+# ---------------- EVENT CATALOG ---------------- #
+
+DEFAULT_TEAM_REQUIREMENTS = {"min": 1, "max": 20}
+DEFAULT_EVENT_RATING = 3
+
+class EventCatalog:
+    """
+    Event names from the registrations, with casefold aliases, team requirements,
+    access codes, star ratings and point tables, for O(1) lookups from the routes.
+    """
+
+    def __init__(self, df, mapping, codes, ratings):
+        self.df = df
+        self.mapping = mapping or {}
+        event_col = self.mapping.get("event")
+        names = []
+        if event_col in df.columns:
+            names = [str(e) for e in df[event_col].dropna().unique() if str(e).strip()]
+        self.names = sorted(set(names))
+        self.name_set = frozenset(self.names)
+        self.registered = {}  # event -> registrations in the workbook (plus journal)
+        if event_col in df.columns:
+            counts = df[event_col].value_counts()
+            self.registered = {str(event): int(count) for event, count in counts.items() if count}
+        self.codes = dict(codes)
+        self.ratings = dict(ratings)
+
+        # casefold -> canonical name; workbook spellings win over config keys
+        self.aliases = {}
+        for name in list(self.names) + list(EVENT_TEAM_REQUIREMENTS) + list(self.codes) + list(self.ratings):
+            self.aliases.setdefault(name.strip().casefold(), name)
+        self._requirements = {}
+        for name, requirements in EVENT_TEAM_REQUIREMENTS.items():
+            self._requirements.setdefault(name.strip().casefold(), requirements)
+
+    def updated(self, df, positions, codes, ratings):
+        """
+        This catalog for df, a frame extending self.df with new rows at positions, or
+        None when those rows bring a new event name and aliases must be rebuilt.
+        """
+        event_col = self.mapping.get("event")
+        added = {}
+        if event_col in df.columns:
+            for event in df[event_col].iloc[sorted(positions)].dropna():
+                event = str(event)
+                if not event.strip():
+                    continue
+                if event not in self.name_set:
+                    return None
+                added[event] = added.get(event, 0) + 1
+        catalog = copy.copy(self)
+        catalog.df = df
+        catalog.registered = dict(self.registered)
+        for event, count in added.items():
+            catalog.registered[event] = catalog.registered.get(event, 0) + count
+        catalog.codes = dict(codes)
+        catalog.ratings = dict(ratings)
+        if catalog.codes.keys() != self.codes.keys() or catalog.ratings.keys() != self.ratings.keys():
+            return None  # Aliases include config keys
+        return catalog
+
+    def has_event(self, event):
+        """Whether event is an event name in the registrations (exact spelling)"""
+        return event in self.name_set
+
+    def resolve(self, event):
+        """Canonical spelling of event, matched case-insensitively, or None"""
+        if not isinstance(event, str):
+            return None
+        return self.aliases.get(event.strip().casefold())
+
+    def requirements(self, event):
+        """{"min", "max"} team size for event, matched case-insensitively"""
+        if event in EVENT_TEAM_REQUIREMENTS:
+            return EVENT_TEAM_REQUIREMENTS[event]
+        if isinstance(event, str):
+            found = self._requirements.get(event.strip().casefold())
+            if found is not None:
+                return found
+        return DEFAULT_TEAM_REQUIREMENTS
+
+    def code(self, event):
+        """Access code for event, or None if it has none"""
+        return self.codes.get(event)
+
+    def rating(self, event):
+        return self.ratings.get(event, DEFAULT_EVENT_RATING)
+
+    def points(self, event):
+        """Points table ({"1st", "2nd", "3rd"}) for event's star rating"""
+        return POINTS_SYSTEM.get(self.rating(event), POINTS_SYSTEM[DEFAULT_EVENT_RATING])
+
+_last_event_catalog = None  # Carried across journal generations for EventCatalog.updated()
+
+def get_event_catalog():
+    """EventCatalog, rebuilt only when the registrations, column map, codes or ratings change"""
+    global _last_event_catalog
+
+    df = load_excel()
+    mapping = load_column_map()
+    _check_file_resource("event_codes", EVENT_CODES_PATH)
+    _check_file_resource("ratings", EVENT_RATINGS_PATH)
+
+    def build():
+        # A journal append only adds rows: count them into the previous catalog
+        previous = _last_event_catalog
+        step = journal_overlay_step(df)
+        if previous is not None and step is not None and previous.df is step[0] and \
+                previous.mapping == (mapping or {}) and previous.mapping.get("event") not in step[2]:
+            catalog = previous.updated(df, step[1] - set(range(len(previous.df))),
+                                       load_event_codes(), load_event_ratings())
+            if catalog is not None:
+                return catalog
+        return EventCatalog(df, mapping, load_event_codes(), load_event_ratings())
+
+    catalog = get_derived_view(
+        "event_catalog", ("workbook", "journal", "column_map", "event_codes", "ratings"), build)
+    if catalog.df is not df:
+        return EventCatalog(df, mapping, load_event_codes(), load_event_ratings())
+    _last_event_catalog = catalog
+    return catalog
+
+def resolve_event_name(event):
+    """Canonical spelling of a requested event name, or the name unchanged if the catalog doesn't know it"""
+    if not isinstance(event, str) or not event.strip():
+        return event
+    try:
+        return get_event_catalog().resolve(event) or event
+    except Exception as e:
+        print(f"ERROR: Could not resolve event name '{event}': {e}")
+        return event
+
+# ---------------- CHAMPIONSHIP LEADERBOARD ---------------- #
+
+def position_key(position):
+    return "1st" if position == 1 else "2nd" if position == 2 else "3rd"
+
+class Leaderboard:
+    """
+    Per-college totals and wins, kept ordered by (-total, college) with bisect so
+    the top k standings are read in O(k). Wins are added and removed one at a time
+    as status entries gain or lose a position.
+    """
+
+    def __init__(self, ratings, generations):
+        self.ratings = dict(ratings)  # Ratings the wins were scored with
+        self.generations = generations  # Registration generations colleges were read at
+        self.colleges = {}  # college -> {"total": points, "wins": {reg_no: win}}
+        self.order = []  # Sorted (-total, college)
+        self.wins = {}  # reg_no -> college
+        self.by_event = {}  # event -> {reg_no: None}
+
+    def _move(self, college, old_total, new_total):
+        if old_total is not None:
+            del self.order[bisect.bisect_left(self.order, (-old_total, college))]
+        if new_total is not None:
+            bisect.insort(self.order, (-new_total, college))
+
+    def add(self, reg_no, college, event, position, rating, points):
+        self.remove(reg_no)
+        entry = self.colleges.get(college)
+        old_total = entry["total"] if entry is not None else None
+        if entry is None:
+            entry = self.colleges[college] = {"total": 0, "wins": {}}
+        entry["total"] += points
+        entry["wins"][reg_no] = {"event": event, "position": position, "points": points, "rating": rating}
+        self.wins[reg_no] = college
+        self.by_event.setdefault(event, {})[reg_no] = None
+        self._move(college, old_total, entry["total"])
+
+    def remove(self, reg_no):
+        college = self.wins.pop(reg_no, None)
+        if college is None:
+            return
+        entry = self.colleges[college]
+        win = entry["wins"].pop(reg_no)
+        regs = self.by_event.get(win["event"], {})
+        regs.pop(reg_no, None)
+        if not regs:
+            self.by_event.pop(win["event"], None)
+        old_total = entry["total"]
+        entry["total"] -= win["points"]
+        if entry["wins"]:
+            self._move(college, old_total, entry["total"])
+        else:
+            del self.colleges[college]
+            self._move(college, old_total, None)
+
+    def standings(self, top=None):
+        """[{"college", "total_points", "wins"}] best first, for the top `top` colleges (all if None)"""
+        order = self.order if top is None else self.order[:top]
+        return [{
+            "college": college,
+            "total_points": -neg_total,
+            "wins": list(self.colleges[college]["wins"].values())
+        } for neg_total, college in order]
+
+_leaderboard = None
+_leaderboard_lock = threading.RLock()  # Held while the board is caught up or read
+
+def score_winners(winners, df, mapping, catalog):
+    """
+    Vectorized scoring of {reg_no: (event, position)} winners: one join against the
+    reg_no index for colleges, one lookup into a rating x position points matrix.
+    Returns a frame of reg_no, college, event, position, rating, points in winner
+    order; winners without a college are dropped.
+    """
+    columns = ["reg_no", "college", "event", "position", "rating", "points"]
+    if not winners:
+        return pd.DataFrame(columns=columns)
+
+    frame = pd.DataFrame({
+        "reg_no": list(winners),
+        "event": [event for event, _ in winners.values()],
+        "position": pd.Series([position for _, position in winners.values()], dtype=object)
+    })
+
+    # Colleges through the reg_no index
+    college_col = (mapping or {}).get("college")
+    if college_col in df.columns:
+        index = get_reg_index(df, mapping)
+        pos = np.fromiter((index.get(normalize_reg_no(reg_no), -1) for reg_no in frame["reg_no"]),
+                          dtype=np.int64, count=len(frame))
+        found = pos >= 0
+        colleges = np.full(len(frame), None, dtype=object)
+        colleges[found] = df[college_col].to_numpy(dtype=object)[pos[found]]
+        frame["college"] = colleges
+    else:
+        frame["college"] = None
+    frame = frame[frame["college"].notna()]
+    frame["college"] = frame["college"].astype(str)
+    frame = frame[frame["college"] != ""]
+
+    # Points: one rating x position matrix row per distinct event
+    codes, events = pd.factorize(frame["event"])
+    event_ratings = [catalog.rating(event) for event in events]
+    frame["rating"] = np.array(event_ratings, dtype=object)[codes]
+    table = np.array([[catalog.points(event).get(key, 0) for key in ("1st", "2nd", "3rd")]
+                      for event in events], dtype=np.int64).reshape(len(events), 3)
+    rows = codes
+    position = frame["position"].to_numpy(dtype=object)
+    cols = np.where(position == 1, 0, np.where(position == 2, 1, 2))
+    frame["points"] = table[rows, cols]
+    return frame[columns].reset_index(drop=True)
+
+def recompute_standings():
+    """
+    Full recompute of the championship standings from status, the registrations and
+    ratings in one pandas pass, for audits after POINTS_SYSTEM or bulk rating edits.
+    Same shape and order as Leaderboard.standings().
+    """
+    catalog = get_event_catalog()
+    df = load_excel()
+    mapping = load_column_map()
+    load_status()
+    with _status_lock:
+        winners = dict(_status_winners)
+    return standings_from_winners(winners, df, mapping, catalog)
+
+def standings_from_winners(winners, df, mapping, catalog):
+    """Score winners, total them per college and sort by (-total, college)"""
+    frame = score_winners(winners, df, mapping, catalog)
+    if frame.empty:
+        return []
+    totals = frame.groupby("college", sort=False)["points"].sum().reset_index()
+    totals = totals.assign(neg=-totals["points"]).sort_values(["neg", "college"], kind="stable")
+
+    wins = {}
+    for college, event, position, points, rating in zip(
+            frame["college"], frame["event"], frame["position"], frame["points"].tolist(), frame["rating"]):
+        wins.setdefault(college, []).append(
+            {"event": event, "position": position, "points": points, "rating": rating})
+    return [{"college": college, "total_points": total, "wins": wins[college]}
+            for college, total in zip(totals["college"], totals["points"].tolist())]
+
+def _score_winner(board, reg_no, winner, schema, catalog):
+    """Add one (event, position) winner to board; winners without a college don't score"""
+    event, position = winner
+    record = schema.find(reg_no)
+    if record is None or record.college is None or not str(record.college):
+        return
+    points = catalog.points(event).get(position_key(position), 0)
+    board.add(reg_no, str(record.college), event, position, catalog.rating(event), points)
+
+def get_standings(top=None):
+    """Leaderboard.standings() read under the leaderboard lock, so another request's catch-up can't move it mid-read"""
+    with _leaderboard_lock:
+        return get_leaderboard().standings(top)
+
+def get_leaderboard():
+    """
+    The championship Leaderboard, caught up with status, rating and registration changes.
+    It is shared: read it while holding _leaderboard_lock (or use get_standings()).
+    """
+    global _leaderboard
+
+    catalog = get_event_catalog()
+    df = load_excel()
+    mapping = load_column_map()
+    load_status()
+    schema = get_compiled_schema(df, mapping)
+    generations = cache_generation("workbook", "journal", "column_map")
+
+    with _leaderboard_lock:
+        with _status_lock:
+            pending = set(_leaderboard_pending)
+            _leaderboard_pending.clear()
+            rebuild = None in pending or _leaderboard is None or _leaderboard.generations != generations
+            winners = dict(_status_winners) if rebuild else {reg_no: _status_winners.get(reg_no) for reg_no in pending}
+
+        if rebuild:
+            # Colleges may have moved: score every winner again
+            board = Leaderboard(catalog.ratings, generations)
+            frame = score_winners({reg_no: winner for reg_no, winner in winners.items() if winner is not None},
+                                  df, mapping, catalog)
+            for reg_no, college, event, position, rating, points in zip(
+                    frame["reg_no"], frame["college"], frame["event"], frame["position"],
+                    frame["rating"], frame["points"].tolist()):
+                board.add(reg_no, college, event, position, rating, points)
+            _leaderboard = board
+            return board
+
+        board = _leaderboard
+        if board.ratings != catalog.ratings:
+            # Re-score only the events whose rating changed
+            changed = {event for event in set(board.ratings) | set(catalog.ratings)
+                       if board.ratings.get(event) != catalog.ratings.get(event)}
+            with _status_lock:
+                for event in changed:
+                    for reg_no in board.by_event.get(event, ()):
+                        winners.setdefault(reg_no, _status_winners.get(reg_no))
+            board.ratings = dict(catalog.ratings)
+        for reg_no, winner in winners.items():
+            board.remove(reg_no)
+            if winner is not None:
+                _score_winner(board, reg_no, winner, schema, catalog)
+        return board
+
+# ---------------- EVENT DASHBOARD ---------------- #
+
+# Materialized per-event summaries served by both dashboards. Status writes queue
+# the events they touch; a read re-summarizes only those, and everything is
+# rebuilt when the EventCatalog (registrations, column map, codes, ratings) moves.
+_event_dashboard = None  # event -> summary dict, replaced (never mutated) on update
+_event_dashboard_catalog = None
+_dashboard_lock = threading.Lock()
+
+def _summarize_event(event, catalog, flags, positions, schema):
+    winners = {}
+    for reg_no, position in positions.items():
+        record = schema.find(reg_no)
+        winners[position] = {
+            "reg_no": reg_no,
+            "team": get_team_for_reg(reg_no),
+            "college": str(record.college) if record is not None and record.college is not None else ""
+        }
+    return {
+        "event_started": flags.get("started", 0) > 0,
+        "event_ended": flags.get("ended", 0) > 0,
+        "winners": winners,
+        "rating": catalog.rating(event),
+        "registered": catalog.registered.get(event, 0),
+        "reported": flags.get("reported", 0)
+    }
+
+def get_event_dashboard():
+    """event -> {event_started, event_ended, winners, rating, registered, reported}; treat as read-only"""
+    global _event_dashboard, _event_dashboard_catalog
+
+    catalog = get_event_catalog()
+    schema = get_compiled_schema(load_excel(), load_column_map())
+    load_status()
+
+    with _dashboard_lock:
+        with _status_lock:
+            pending = set(_dashboard_pending)
+            _dashboard_pending.clear()
+            rebuild = None in pending or _event_dashboard is None or _event_dashboard_catalog is not catalog
+            events = list(dict.fromkeys([*catalog.names, *_status_event_index])) if rebuild else pending
+            state = {event: (dict(_status_event_flags.get(event, {})),
+                             dict(_status_event_positions.get(event, {})),
+                             event in _status_event_index)
+                     for event in events}
+
+        view = {} if rebuild else dict(_event_dashboard)
+        for event, (flags, positions, has_status) in state.items():
+            if has_status or catalog.has_event(event):
+                view[event] = _summarize_event(event, catalog, flags, positions, schema)
+            else:
+                view.pop(event, None)
+        _event_dashboard = view
+        _event_dashboard_catalog = catalog
+        return view
+
+def status_events():
+    """Events that have at least one status entry"""
+    load_status()
+    return set(_status_event_index)
+
 # ---------------- TEAM EXTRACTION ---------------- #
 
-def extract_team(row, mapping):
+def normalize_team(names):
+    """Strip names and drop blanks and case-insensitive duplicates (first spelling wins)"""
     team = []
     seen = set()
-
-    leader_col = mapping.get("team_leader")
-    if leader_col and pd.notna(row.get(leader_col)):
-        leader = str(row[leader_col]).strip()
-        if leader.lower() not in seen:
-            team.append(leader)
-            seen.add(leader.lower())
-
-    # Handle team_members columns
-    for col in mapping.get("team_members", []):
-        if col in row and pd.notna(row[col]):
-            member = str(row[col]).strip()
-            if member.lower() not in seen:
-                team.append(member)
-                seen.add(member.lower())
-
-    # Also check for "participants" and "students" columns directly in Excel
-    for col in row.index:
-        col_lower = str(col).lower()
-        if col_lower in ["participants", "students"] and pd.notna(row[col]):
-            member = str(row[col]).strip()
-            if member and member.lower() not in seen:
-                team.append(member)
-                seen.add(member.lower())
-
+    for name in names:
+        if name is None or (isinstance(name, float) and pd.isna(name)):
+            continue
+        name = str(name).strip()
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            team.append(name)
     return team
 
-# ---------------- TEAM OVERRIDES ---------------- #
-
-def get_team_for_reg(reg_no, row, mapping, status):
+def _team_columns(columns, mapping):
+    """Team columns in roster order: leader, mapped member columns, then participants/students columns"""
+    present = set(columns)
+    team_cols = []
+    for col in [mapping.get("team_leader")] + list(mapping.get("team_members", [])):
+        if col in present and col not in team_cols:
+            team_cols.append(col)
+    for col in columns:
+        if str(col).lower() in CompiledSchema.TEAM_COLUMNS and col not in team_cols:
+            team_cols.append(col)
+    return team_cols
+
+class RegistrationRecord:
+    """One registration's mapped fields, read from a CompiledSchema row (None = blank cell)"""
+    __slots__ = ("reg_no", "event", "college", "contact")
+
+    def __init__(self, reg_no, event, college, contact):
+        self.reg_no = reg_no
+        self.event = event
+        self.college = college
+        self.contact = contact
+
+    @property
+    def team(self):
+        """Roster from the registrations, ignoring status overrides (see get_team_for_reg)"""
+        return workbook_team(self.reg_no)
+
+_last_compiled_schema = None  # Carried across journal generations for CompiledSchema.updated()
+
+class CompiledSchema:
+    """
+    column_map.json resolved against one registrations frame. Column positions are
+    looked up once and the mapped columns are copied out as plain tuples (blank
+    cells as None), so per-row field reads never touch pandas. Teams come from the
+    roster table.
+    """
+    FIELDS = ("reg_no", "event", "college", "contact")
+    TEAM_COLUMNS = ("participants", "students")
+
+    def __init__(self, df, mapping):
+        self.df = df
+        self.mapping = mapping or {}
+        columns = list(df.columns)
+        present = set(columns)
+        folded = {}
+        for col in columns:
+            folded.setdefault(str(col).strip().lower(), col)
+
+        def resolve(name):
+            if not isinstance(name, str) or not name:
+                return None
+            if name in present:
+                return name
+            return folded.get(name.strip().lower())
+
+        field_cols = {field: resolve(self.mapping.get(field)) for field in self.FIELDS}
+        selected = list(dict.fromkeys(col for col in field_cols.values() if col is not None))
+        position = {col: i for i, col in enumerate(selected)}
+        self.field_positions = {field: position.get(col) for field, col in field_cols.items()}
+        self.columns = selected
+
+        self.rows = self._read_rows(df)
+
+    def _read_rows(self, df):
+        frame = df[self.columns].astype(object)
+        frame = frame.where(frame.notna(), None)
+        return list(frame.itertuples(index=False, name=None))
+
+    def updated(self, df, positions):
+        """This schema for df, a frame extending self.df: only the rows at positions are re-read"""
+        schema = copy.copy(self)
+        schema.df = df
+        schema.rows = list(self.rows)
+        positions = sorted(positions)
+        if positions:
+            for pos, values in zip(positions, self._read_rows(df.iloc[positions])):
+                if pos < len(schema.rows):
+                    schema.rows[pos] = values
+                else:
+                    schema.rows.append(values)
+        return schema
+
+    def field(self, values, name):
+        pos = self.field_positions.get(name)
+        return values[pos] if pos is not None else None
+
+    def record(self, pos):
+        values = self.rows[pos]
+        reg_no = self.field(values, "reg_no")
+        return RegistrationRecord(
+            reg_no,
+            self.field(values, "event"),
+            self.field(values, "college"),
+            self.field(values, "contact")
+        )
+
+    def find(self, reg_no):
+        """RegistrationRecord for reg_no through the reg_no index, or None"""
+        pos = find_registration_position(self.df, self.mapping, reg_no)
+        return self.record(pos) if pos is not None else None
+
+def get_compiled_schema(df, mapping):
+    """
+    CompiledSchema for df, built once per workbook, journal and column map generation.
+    After a journal append or patch only the overlay's changed rows are re-read.
+    """
+    global _last_compiled_schema
+
+    def build():
+        previous = _last_compiled_schema
+        step = journal_overlay_step(df)
+        if previous is not None and step is not None and previous.df is step[0] and \
+                previous.mapping == (mapping or {}):
+            return previous.updated(df, step[1])
+        return CompiledSchema(df, mapping)
+
+    schema = get_derived_view("compiled_schema", ("workbook", "journal", "column_map"), build)
+    if schema.df is not df or schema.mapping != (mapping or {}):
+        return CompiledSchema(df, mapping)  # Not the frame the cached schema was built for
+    _last_compiled_schema = schema
+    return schema
+
+# ---------------- TEAM ROSTERS ---------------- #
+
+# reg_no -> team, materialized so roster-listing routes only do lookups:
+#   - workbook rosters are built in one vectorized pass per workbook generation
+#   - journaled spot registrations add their roster as they are appended, and a
+#     journaled patch to team cells marks the roster for re-reading from the overlay
+#   - status team_override lists are normalized when written into the status index
+def _build_rosters(df, mapping):
+    """Vectorized reg_no key -> team tuple for every row of df"""
+    index = get_reg_index(df, mapping)
+    team_cols = _team_columns(list(df.columns), mapping)
+    parts = []
+    for order, col in enumerate(team_cols):
+        values = df[col]
+        mask = values.notna().to_numpy()
+        names = values[mask].astype(str).str.strip()
+        keep = (names != "").to_numpy()
+        parts.append(pd.DataFrame({
+            "row": np.flatnonzero(mask)[keep],
+            "order": order,
+            "name": names[keep].to_numpy()
+        }))
+    if not parts:
+        return {reg_key: () for reg_key in index}
+
+    members = pd.concat(parts, ignore_index=True)
+    members["key"] = members["name"].str.lower()
+    members = members.sort_values(["row", "order"], kind="stable").drop_duplicates(["row", "key"])
+    teams = members.groupby("row", sort=False)["name"].agg(tuple).to_dict()
+    return {reg_key: teams.get(pos, ()) for reg_key, pos in index.items()}
+
+def get_workbook_rosters():
+    """
+    reg_no key -> team tuple for the cached workbook (journal rows not included).
+    Reads the frame the request already loaded, so per-registration lookups skip the freshness checks.
+    """
+    base = _excel_cache
+    if base is None:
+        base = _load_workbook_frame()
+    view = get_derived_view("workbook_rosters", ("workbook", "column_map"),
+                            lambda: (base, _build_rosters(base, load_column_map() or {})))
+    if view[0] is not base:
+        return _build_rosters(base, load_column_map() or {})
+    return view[1]
+
+def _journal_roster_update(record, mapping, rosters, dirty):
+    """Fold one journal record into the journal roster dict and dirty set"""
+    reg_key = normalize_reg_no(record.get("reg_no"))
+    if not reg_key:
+        return
+    if record.get("op") == "append":
+        row = record.get("row") or {}
+        rosters.setdefault(reg_key, tuple(normalize_team(row[col] for col in _team_columns(list(row), mapping))))
+    elif record.get("op") == "patch":
+        team_cols = {mapping.get("team_leader"), *mapping.get("team_members", [])}
+        if any(col in team_cols or str(col).lower() in CompiledSchema.TEAM_COLUMNS
+               for col in record.get("cells") or {}):
+            dirty.add(reg_key)
+
+def _journal_rosters():
+    """(rosters, dirty) for the cached journal, built on first use and then kept incrementally"""
+    global _spot_journal_rosters, _spot_journal_dirty
+
+    records = load_spot_journal(refresh=False)
+    mapping = load_column_map() or {}
+    with _cache_lock:
+        if _spot_journal_rosters is None or _spot_journal_cache is not records:
+            rosters, dirty = {}, set()
+            for record in records:
+                _journal_roster_update(record, mapping, rosters, dirty)
+            if _spot_journal_cache is not records:
+                return rosters, dirty  # Journal changed underneath; don't cache a stale build
+            _spot_journal_rosters, _spot_journal_dirty = rosters, dirty
+        return _spot_journal_rosters, _spot_journal_dirty
+
+def workbook_team(reg_no):
+    """Team from the registrations (workbook plus journal), ignoring status overrides"""
+    reg_key = normalize_reg_no(reg_no)
+    if load_spot_journal(refresh=False):
+        journal_rosters, dirty = _journal_rosters()
+        if reg_key in dirty:
+            # Team cells were patched: read the patched row from the overlay
+            df = load_excel()
+            mapping = load_column_map() or {}
+            row = find_registration(df, mapping, reg_no)
+            if row is None:
+                return []
+            return normalize_team(row[col] for col in _team_columns(list(df.columns), mapping))
+        team = get_workbook_rosters().get(reg_key)
+        if team is None:
+            team = journal_rosters.get(reg_key, ())
+        return list(team)
+    return list(get_workbook_rosters().get(reg_key, ()))
+
+def get_team_for_reg(reg_no):
     """
     Returns team list for a registration number.
     Priority:
       1) status[reg_no]['team_override'] if present and non-empty (for recently edited teams)
-      2) extracted team from Excel row (primary source)
+      2) the registration's roster from the workbook (primary source)
     """
-    try:
-        # First check for override (for recently edited teams)
-        override = status.get(reg_no, {}).get("team_override")
-        if isinstance(override, list) and len([x for x in override if str(x).strip()]) > 0:
-            # normalize + drop blanks
-            out = []
-            seen = set()
-            for name in override:
-                name = str(name).strip()
-                if not name:
-                    continue
-                key = name.lower()
-                if key in seen:
-                    continue
-                seen.add(key)
-                out.append(name)
-            return out
-    except Exception:
-        pass
+    load_status()  # Keeps the override index in step with other workers
+    override = _status_team_overrides.get(reg_no)
+    if override:
+        return list(override)
+    return workbook_team(reg_no)
+
+# ---------------- CONDITIONAL RESPONSES ---------------- #
+
+# Polled views are versioned by the generations of the resources they read: an
+# unchanged version means an unchanged response, so a poll carrying it is answered
+# without rebuilding or serializing the view. Generations are per worker, so the
+# version carries a per-process nonce and a poll landing on another worker just
+# gets the full response.
+_VERSION_NONCE = secrets.token_hex(4)
+REPORTED_TEAMS_RESOURCES = ("status", "workbook", "journal", "column_map")
+EVENT_VIEW_RESOURCES = ("status", "workbook", "journal", "column_map", "event_codes", "ratings")
+_conditional_stats = {"full": 0, "not_modified": 0}
+
+def data_version(*resources):
+    """Opaque version of the given resources, after picking up changes from other workers"""
+    if "status" in resources:
+        load_status()
+    if "workbook" in resources or "journal" in resources:
+        load_excel()
+    if "column_map" in resources:
+        load_column_map()
+    if "event_codes" in resources:
+        _check_file_resource("event_codes", EVENT_CODES_PATH)
+    if "ratings" in resources:
+        _check_file_resource("ratings", EVENT_RATINGS_PATH)
+    return _VERSION_NONCE + "-" + "-".join(str(g) for g in cache_generation(*resources))
+
+def _count_conditional(name):
+    with _cache_lock:
+        _conditional_stats[name] += 1
+
+def conditional_get(*resources, long_poll=False):
+    """
+    ETag the view with data_version(resources) and answer a matching If-None-Match with 304.
+    With long_poll, ?wait=seconds parks a matching request until the data changes or the wait ends.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = data_version(*resources)
+            wait = request.args.get("wait", type=float) if long_poll else None
+            # If-None-Match uses the weak comparison (RFC 7232), so ETags a proxy weakened still match
+            if wait and wait > 0 and request.if_none_match.contains_weak(etag):
+                if not park_until(lambda: not request.if_none_match.contains_weak(data_version(*resources)),
+                                  None, wait):
+                    return _long_poll_busy()
+                etag = data_version(*resources)
+            if request.if_none_match.contains_weak(etag):
+                _count_conditional("not_modified")
+                response = app.response_class(status=304)
+            else:
+                _count_conditional("full")
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return decorated_function
+    return decorator
+
+def get_conditional_stats():
+    with _cache_lock:
+        return dict(_conditional_stats)
+
+# ---------------- ROSTER FEED ---------------- #
+
+# Change feed behind the live roster stream and delta sync. The status write
+# path (and registration reloads) call notify_roster_feed with the events and
+# reg_nos they touched; streams block on one condition variable instead of
+# polling on timers, and a bounded per-event change log answers "what changed
+# since cursor". Other workers' commits reach this worker through a single
+# watcher thread that runs the usual status/workbook coherence checks while any
+# stream is open (delta polls run those checks themselves).
+ROSTER_STREAM_HEARTBEAT = 15  # Seconds between heartbeat comments
+ROSTER_STREAM_MAX_SECONDS = 300  # Streams close after this; the browser reconnects
+ROSTER_STREAM_RETRY_MS = 3000
+MAX_ROSTER_STREAMS = 50  # Open streams per worker; each one holds a thread
+LONG_POLL_MAX_SECONDS = 25  # Longest a long-poll request is parked
+MAX_PARKED_POLLS = 32  # Parked long-polls per worker; past this, polls are answered at once
+# How the coordinator and certificate pages follow changes: "sse" (coordinator
+# stream, falling back to polling), "longpoll" for proxies that buffer streams, or "poll"
+LIVE_UPDATE_MODE = os.environ.get("LIVE_UPDATE_MODE", "sse")
+ROSTER_CHANGE_LOG_SIZE = 512  # Changes kept per event; older cursors get a snapshot
+_roster_feed_cond = threading.Condition()
+_roster_feed_seq = 0
+_roster_feed_event_seq = {}  # event -> feed seq of its last change
+_roster_feed_reset_seq = 0  # Feed seq of the last change that touched every event
+_roster_change_log = {}  # event -> deque of (feed seq, reg_no)
+_roster_change_floor = {}  # event -> feed seq of the newest change evicted from its log
+_roster_streams = 0
+_parked_polls = 0
+_rejected_polls = 0  # Long-polls turned away at MAX_PARKED_POLLS
+_roster_watcher = None
+
+def notify_roster_feed(events):
+    """
+    Record a change and wake the streams. events maps event -> changed reg_nos;
+    None means every event may have changed (registrations reloaded, status rebuilt).
+    """
+    global _roster_feed_seq, _roster_feed_reset_seq
+
+    with _roster_feed_cond:
+        _roster_feed_seq += 1
+        if events is None:
+            _roster_feed_reset_seq = _roster_feed_seq
+            _roster_change_log.clear()
+            _roster_change_floor.clear()
+        else:
+            for event, reg_nos in events.items():
+                _roster_feed_event_seq[event] = _roster_feed_seq
+                log = _roster_change_log.setdefault(event, deque(maxlen=ROSTER_CHANGE_LOG_SIZE))
+                for reg_no in reg_nos:
+                    if len(log) == log.maxlen:
+                        _roster_change_floor[event] = log[0][0]
+                    log.append((_roster_feed_seq, reg_no))
+        _roster_feed_cond.notify_all()
+
+def roster_changes_since(event, cursor):
+    """
+    (feed seq now, reg_nos changed in event since cursor), or (feed seq now, None)
+    when the cursor is unknown, from another worker, or older than the change log.
+    """
+    with _roster_feed_cond:
+        now = _roster_feed_seq
+        prefix = f"{_VERSION_NONCE}-"
+        if not isinstance(cursor, str) or not cursor.startswith(prefix):
+            return now, None
+        try:
+            seq = int(cursor[len(prefix):])
+        except ValueError:
+            return now, None
+        if seq > now or seq < _roster_feed_reset_seq or seq < _roster_change_floor.get(event, 0):
+            return now, None
+        changed = dict.fromkeys(reg_no for change_seq, reg_no in _roster_change_log.get(event, ())
+                                if change_seq > seq)
+        return now, list(changed)
+
+def roster_feed_seq(event):
+    """Feed position of event's last change (event None: of the last change anywhere)"""
+    with _roster_feed_cond:
+        return _roster_feed_position(event)
+
+def _roster_feed_position(event):
+    if event is None:
+        return _roster_feed_seq
+    return max(_roster_feed_event_seq.get(event, 0), _roster_feed_reset_seq)
+
+def roster_event_id(seq):
+    """SSE id for a feed position; only meaningful to the worker that issued it"""
+    return f"{_VERSION_NONCE}-{seq}"
+
+def wait_roster_feed(event, seq, timeout):
+    """Block until event changes past feed position seq; its new position, or None on timeout"""
+    deadline = time.monotonic() + timeout
+    with _roster_feed_cond:
+        while True:
+            current = _roster_feed_position(event)
+            if current > seq:
+                return current
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            _roster_feed_cond.wait(remaining)
+
+def _ensure_roster_watcher():
+    """Start the coherence watcher if it isn't running; caller holds _roster_feed_cond"""
+    global _roster_watcher
+
+    if _roster_watcher is None:
+        _roster_watcher = threading.Thread(target=_watch_roster_sources, daemon=True)
+        _roster_watcher.start()
+
+def _acquire_roster_stream():
+    global _roster_streams
+
+    with _roster_feed_cond:
+        if _roster_streams >= MAX_ROSTER_STREAMS:
+            return False
+        _roster_streams += 1
+        _ensure_roster_watcher()
+        return True
+
+def _release_roster_stream():
+    global _roster_streams
+
+    with _roster_feed_cond:
+        _roster_streams -= 1
+
+def park_until(changed, event, timeout):
+    """
+    Long-poll: block while changed() is false, re-checking whenever the roster feed
+    moves for event (None = any event) and at least every COHERENCE_INTERVAL (some
+    writes, e.g. journal patches or rating edits, move versions without the feed),
+    for at most timeout seconds. Returns False without waiting when the worker
+    already has MAX_PARKED_POLLS parked requests.
+    """
+    global _parked_polls, _rejected_polls
 
+    with _roster_feed_cond:
+        if _parked_polls >= MAX_PARKED_POLLS:
+            _rejected_polls += 1
+            return False
+        _parked_polls += 1
+        _ensure_roster_watcher()
     try:
-        # Fallback to Excel data
-        excel_team = extract_team(row, mapping) if row is not None else []
-        if excel_team:  # If Excel has team data, use it
-            return excel_team
-    except Exception:
-        pass
+        deadline = time.monotonic() + min(timeout, LONG_POLL_MAX_SECONDS)
+        seq = roster_feed_seq(event)
+        while not changed():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            seq = wait_roster_feed(event, seq, min(remaining, COHERENCE_INTERVAL)) or seq
+    finally:
+        with _roster_feed_cond:
+            _parked_polls -= 1
+    return True
 
-    return []
+def _long_poll_busy():
+    """503 for a long-poll turned away at MAX_PARKED_POLLS, so the client backs off instead of re-polling at once"""
+    response = jsonify({"error": "Too many waiting requests, retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(ROSTER_STREAM_RETRY_MS // 1000)
+    return response
+
+def get_live_update_stats():
+    with _roster_feed_cond:
+        return {"streams": _roster_streams, "parked_polls": _parked_polls,
+                "rejected_polls": _rejected_polls, "feed_seq": _roster_feed_seq}
+
+def _watch_roster_sources():
+    """Pick up other workers' writes while streams or long-polls are open; changes notify through the usual paths"""
+    global _roster_watcher
+
+    while True:
+        time.sleep(COHERENCE_INTERVAL)
+        with _roster_feed_cond:
+            if _roster_streams <= 0 and _parked_polls <= 0:
+                _roster_watcher = None
+                return
+        try:
+            data_version(*REPORTED_TEAMS_RESOURCES)
+        except Exception as e:
+            print(f"ERROR: Roster feed coherence check failed: {e}")
 
 # ---------------- ROUTES ---------------- #
 
@@ -739,7 +3341,7 @@ def register_desk_page():
 @app.route("/certificate")
 @page_role_required("certificate")
 def certificate_page():
-    return render_template("certificate.html")
+    return render_template("certificate.html", live_update_mode=LIVE_UPDATE_MODE)
 
 @app.route("/admin")
 @page_role_required("admin")
@@ -753,15 +3355,14 @@ def super_admin_page():
 
 @app.route("/coordinator")
 def coordinator_page():
-    return render_template("coordinator.html")
+    return render_template("coordinator.html", live_update_mode=LIVE_UPDATE_MODE)
 
 # ---------- ADMIN APIs ---------- #
 
 @app.route("/get_excel_columns")
 @login_required
 def get_excel_columns():
-    df = load_excel()
-    return jsonify(df.columns.tolist())
+    return jsonify(read_excel_columns())
 
 @app.route("/get_column_map")
 @login_required
@@ -804,6 +3405,7 @@ def set_event_code():
     if len(code) != 6:
         return jsonify({"error": "Code must be exactly 6 characters"})
     
+    event = resolve_event_name(event)
     event_codes = load_event_codes()
     event_codes[event] = code.upper()
     save_event_codes(event_codes)
@@ -813,16 +3415,8 @@ def set_event_code():
 @app.route("/get_events")
 def get_events():
     try:
-        # Get unique events from Excel file ONLY (this is the source of truth)
-        df = load_excel()
-        mapping = load_column_map()
-        
-        if mapping and mapping.get("event") in df.columns:
-            events = df[mapping["event"]].dropna().unique().tolist()
-            events = [e for e in events if str(e).strip()]  # Remove empty values
-            return jsonify(sorted(events))  # Sort alphabetically
-        else:
-            return jsonify([])
+        # Events from the Excel file ONLY (this is the source of truth), sorted alphabetically
+        return jsonify(get_event_catalog().names)
     except Exception as e:
         return jsonify([])
 
@@ -838,31 +3432,9 @@ def get_event_requirements():
     if len(event) > 100:
         return jsonify({"error": "Invalid event name length"}), 400
     
-    print(f"DEBUG: Looking up requirements for event: '{event}'")
-    print(f"DEBUG: Available events: {list(EVENT_TEAM_REQUIREMENTS.keys())}")
-    
-    requirements = None
-    event_lower = event.lower()
-    
-    # Try exact match first
-    if event in EVENT_TEAM_REQUIREMENTS:
-        requirements = EVENT_TEAM_REQUIREMENTS[event]
-        print(f"DEBUG: Exact match found for '{event}': {requirements}")
-    else:
-        # Try case-insensitive match
-        for key, value in EVENT_TEAM_REQUIREMENTS.items():
-            if key.lower() == event_lower:
-                requirements = value
-                print(f"DEBUG: Case-insensitive match found: '{event}' -> '{key}': {requirements}")
-                break
-    
-    # If still not found, use default
-    if not requirements:
-        print(f"DEBUG: No match found for '{event}', using default")
-        requirements = {"min": 1, "max": 20}
-    
-    print(f"DEBUG: Final requirements for '{event}': {requirements}")
-    return jsonify(requirements)
+    # Exact match, then case-insensitive, then the default
+    catalog = get_event_catalog()
+    return jsonify(catalog.requirements(catalog.resolve(event) or event))
 
 @csrf.exempt
 @app.route("/add_college", methods=["POST"])
@@ -876,20 +3448,14 @@ def add_college():
     
     # Load existing colleges
     try:
-        colleges_path = os.path.join(BASE_DIR, "data", "colleges.json")
-        colleges = []
-        
-        if os.path.exists(colleges_path):
-            with open(colleges_path, 'r') as f:
-                colleges = json.load(f)
+        colleges = load_colleges()
         
         # Add new college if not exists
         if college not in colleges:
             colleges.append(college)
             
             # Save to file
-            with open(colleges_path, 'w') as f:
-                json.dump(colleges, f, indent=2)
+            save_colleges(colleges)
             
             return jsonify({"success": True, "message": "College added successfully"})
         else:
@@ -919,20 +3485,18 @@ def update_college():
             return jsonify({"error": "College column not mapped"}), 400
         
         # Find the registration
-        row = df[df[mapping["reg_no"]] == reg_no]
-        if row.empty:
+        row = find_registration(df, mapping, reg_no)
+        if row is None:
             return jsonify({"error": "Registration not found"}), 404
         
-        # Update Excel file
-        idx = row.index[0]
-        df.at[idx, mapping["college"]] = college
-        df.to_excel(EXCEL_PATH, index=False)
+        # Update Excel file (a single-cell patch)
+        reg_no = canonical_reg_no(row[mapping["reg_no"]])
+        patch_registration(reg_no, {mapping["college"]: college})
         
         # Also update status if exists
         status = load_status()
         if reg_no in status:
-            status[reg_no]["college"] = college
-            save_status(status)
+            update_status({reg_no: {"college": college}})
         
         return jsonify({"success": True, "message": "College updated successfully"})
         
@@ -1120,12 +3684,7 @@ def get_colleges():
     
     # Load custom colleges from file
     try:
-        colleges_path = os.path.join(BASE_DIR, "data", "colleges.json")
-        custom_colleges = []
-        
-        if os.path.exists(colleges_path):
-            with open(colleges_path, 'r') as f:
-                custom_colleges = json.load(f)
+        custom_colleges = load_colleges()
         
         # Combine default and custom colleges, remove duplicates
         all_colleges = default_colleges.copy()
@@ -1207,12 +3766,11 @@ def change_user_password():
         return jsonify({"error": "Failed to update password"}), 500
     """Initialize event codes from Excel events"""
     try:
-        df = load_excel()
         mapping = load_column_map()
         if not mapping:
             return jsonify({"error": "Column mapping not set"})
         
-        events = df[mapping["event"]].dropna().unique().tolist()
+        events = get_event_catalog().names
         event_codes = load_event_codes()
         
         import random
@@ -1236,42 +3794,11 @@ def change_user_password():
 
 # ✅ EVENT-WISE ADMIN DASHBOARD
 @app.route("/admin_dashboard")
+@conditional_get(*EVENT_VIEW_RESOURCES)
 def admin_dashboard():
-    df = load_excel()
-    mapping = load_column_map()
-    status = load_status()
-
-    events = {}
-
-    for reg_no, data in status.items():
-        event = data.get("event")
-        if not event:
-            continue
-
-        events.setdefault(event, {
-            "event_started": False,
-            "event_ended": False,
-            "winners": {}
-        })
-
-        if data.get("event_started"):
-            events[event]["event_started"] = True
-
-        if data.get("event_ended"):
-            events[event]["event_ended"] = True
-
-        if "position" in data:
-            row = df[df[mapping["reg_no"]] == reg_no]
-            team = []
-            if not row.empty:
-                team = extract_team(row.iloc[0], mapping)
-
-            events[event]["winners"][data["position"]] = {
-                "reg_no": reg_no,
-                "team": team
-            }
-
-    return jsonify(events)
+    # Only events someone has a status entry for
+    active = status_events()
+    return jsonify({event: summary for event, summary in get_event_dashboard().items() if event in active})
 
 # ---------- REGISTRATION DESK ---------- #
 
@@ -1292,17 +3819,17 @@ def get_registration():
     mapping = load_column_map()
     status = load_status()
 
-    row = df[df[mapping["reg_no"]] == reg_no]
-    if row.empty:
+    record = get_compiled_schema(df, mapping).find(reg_no)
+    if record is None:
         return jsonify({"error": "Not found"}), 404
 
-    row = row.iloc[0]
-    team = get_team_for_reg(reg_no, row, mapping, status)
+    reg_no = canonical_reg_no(record.reg_no)
+    team = get_team_for_reg(reg_no)
     
     return jsonify({
         "success": True,
-        "event": str(row[mapping["event"]]) if pd.notna(row[mapping["event"]]) else "Unknown Event",
-        "college": str(row[mapping["college"]]) if pd.notna(row[mapping["college"]]) else "Unknown College",
+        "event": str(record.event) if record.event is not None else "Unknown Event",
+        "college": str(record.college) if record.college is not None else "Unknown College",
         "team": team,
         "team_size": len(team)
     })
@@ -1322,17 +3849,7 @@ def update_team_members():
         return jsonify({"error": "team must be a list"})
 
     # normalize + validate
-    cleaned = []
-    seen = set()
-    for name in team:
-        name = str(name).strip()
-        if not name:
-            continue
-        key = name.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        cleaned.append(name)
+    cleaned = normalize_team(team)
 
     if len(cleaned) == 0:
         return jsonify({"error": "At least one team member name is required"})
@@ -1344,43 +3861,31 @@ def update_team_members():
     if not mapping:
         return jsonify({"error": "Column mapping not set. Please contact admin."})
 
-    row = df[df[mapping["reg_no"]] == reg_no]
-    if row.empty:
+    row0 = find_registration(df, mapping, reg_no)
+    if row0 is None:
         return jsonify({"error": "Registration not found"})
 
-    row0 = row.iloc[0]
+    reg_no = canonical_reg_no(row0[mapping["reg_no"]])
     event = row0[mapping["event"]]
 
-    # Update Excel file
+    # Update team member columns, clearing any extra ones
+    cells = {}
+    team_members_cols = mapping.get("team_members", [])
+    for i, col in enumerate(team_members_cols):
+        cells[col] = cleaned[i] if i < len(cleaned) else ""
+    
+    # Update team leader if exists
+    if "team_leader" in mapping and cleaned:
+        cells[mapping["team_leader"]] = cleaned[0]
+
+    # Update Excel file (only the team cells are patched)
     try:
-        # Find the row index
-        idx = df[df[mapping["reg_no"]] == reg_no].index[0]
-        
-        # Update team member columns
-        team_members_cols = mapping.get("team_members", [])
-        for i, name in enumerate(cleaned):
-            if i < len(team_members_cols):
-                df.at[idx, team_members_cols[i]] = name
-        
-        # Clear any extra team member columns
-        for i in range(len(cleaned), len(team_members_cols)):
-            df.at[idx, team_members_cols[i]] = ""
-        
-        # Update team leader if exists
-        if "team_leader" in mapping and cleaned:
-            df.at[idx, mapping["team_leader"]] = cleaned[0]
-        
-        # Save to Excel
-        df.to_excel(EXCEL_PATH, index=False)
+        patch_registration(reg_no, cells)
     except Exception as e:
         return jsonify({"error": f"Failed to update Excel: {str(e)}"})
 
     # Also save to status for backup
-    status = load_status()
-    status.setdefault(reg_no, {})
-    status[reg_no]["event"] = event
-    status[reg_no]["team_override"] = cleaned
-    save_status(status)
+    update_status({reg_no: {"event": event, "team_override": cleaned}})
 
     return jsonify({"success": True, "team_size": len(cleaned)})
 
@@ -1424,41 +3929,35 @@ def mark_reported():
 
         # Find registration
         print(f"DEBUG: Searching for reg_no '{reg_no}' in column '{mapping['reg_no']}'")
-        row = df[df[mapping["reg_no"]] == reg_no]
-        print(f"DEBUG: Found {len(row)} matching rows")
+        record = get_compiled_schema(df, mapping).find(reg_no)
         
-        if row.empty:
+        if record is None:
             print(f"ERROR: Registration not found: {reg_no}")
             return jsonify({"error": "Registration not found"}), 404
+        reg_no = canonical_reg_no(record.reg_no)
 
         # Get event
         try:
-            event = row.iloc[0][mapping["event"]]
+            event = record.event
             print(f"DEBUG: Found event: {event}")
         except Exception as e:
             print(f"ERROR: Failed to get event: {e}")
             return jsonify({"error": "Failed to determine event"}), 500
 
         # 🔒 EVENT LOCK CHECK
-        for s in status.values():
-            if s.get("event") == event and s.get("event_ended"):
-                print(f"ERROR: Event {event} already completed")
-                return jsonify({"error": "Event already completed. Reporting locked."}), 400
-
-        # Update status
-        status.setdefault(reg_no, {})
-        status[reg_no].update({
-            "event": event,
-            "reported": True,
-            "event_started": False,
-            "event_ended": False
-        })
-        print(f"DEBUG: Updated status for {reg_no}")
+        if event_is_ended(event):
+            print(f"ERROR: Event {event} already completed")
+            return jsonify({"error": "Event already completed. Reporting locked."}), 400
 
-        # Save status
+        # Update status (single-row write)
         try:
-            save_status(status)
-            print(f"DEBUG: Status saved successfully")
+            update_status({reg_no: {
+                "event": event,
+                "reported": True,
+                "event_started": False,
+                "event_ended": False
+            }})
+            print(f"DEBUG: Status saved successfully for {reg_no}")
         except Exception as e:
             print(f"ERROR: Failed to save status: {e}")
             return jsonify({"error": f"Failed to save status: {str(e)}"}), 500
@@ -1504,38 +4003,28 @@ def verify_event_code():
     if not event or not code:
         return jsonify({"success": False, "error": "Event and code required"}), 400
 
-    # Get actual events from Excel file
+    # Check if event exists in Excel
     try:
-        df = load_excel()
-        mapping = load_column_map()
-        
-        if mapping and mapping.get("event") in df.columns:
-            excel_events = df[mapping["event"]].dropna().unique().tolist()
-            excel_events = [e for e in excel_events if str(e).strip()]
-        else:
-            excel_events = []
+        catalog = get_event_catalog()
     except:
-        excel_events = []
-    
-    # Check if event exists in Excel
-    if event not in excel_events:
+        return jsonify({"success": False, "error": "Event not found in system"}), 400
+    event = catalog.resolve(event) or event
+    if not catalog.has_event(event):
         return jsonify({"success": False, "error": "Event not found in system"}), 400
 
-    # For now, accept any non-empty code (or you can load from event_codes.json if it has codes)
-    event_codes = load_event_codes()
-    
     # If code exists in codes file, verify it; otherwise accept any code
-    if event in event_codes:
-        if event_codes[event].upper() == code.upper():
+    event_code = catalog.code(event)
+    if event_code is not None:
+        if event_code.upper() == code.upper():
             session["verified_event"] = event
-            return jsonify({"success": True})
+            return jsonify({"success": True, "event": event})
         else:
             return jsonify({"success": False, "error": "Invalid code"}), 401
     else:
         # Event not in codes file, accept any non-empty code
         if code.strip():
             session["verified_event"] = event
-            return jsonify({"success": True})
+            return jsonify({"success": True, "event": event})
         else:
             return jsonify({"success": False, "error": "Code required"}), 400
 
@@ -1549,56 +4038,189 @@ def verify_event_code():
 @app.route("/get_reported_teams", methods=["POST"])
 @event_verified_required
 def get_reported_teams():
-    """Optimized version to handle high traffic"""
+    """
+    Optimized version to handle high traffic. Clients echo the `version` of their
+    last response; while it is current the reply is just {"unchanged": true}.
+    Long-poll mode: with "wait": seconds, a current version parks the request
+    until the event's roster changes or the wait ends.
+    """
     try:
         data = request.get_json(silent=True) or {}
         event = data.get("event")
 
-        # Use cached data
-        df = load_excel()
-        mapping = load_column_map()
-        status = load_status()
+        # The event's roster feed position, tagged with the event so a version
+        # echoed after switching events never matches
+        event_tag = hashlib.sha1(str(event).encode("utf-8")).hexdigest()[:8]
 
-        result = []
-        event_started = False
+        def current_version():
+            data_version(*REPORTED_TEAMS_RESOURCES)  # Pick up other workers' writes first
+            return f"{roster_event_id(roster_feed_seq(event))}-{event_tag}"
 
-        # Only get teams from status.json - optimized loop
-        for reg_no, info in status.items():
-            if info.get("reported") and info.get("event") == event:
-                event_started |= info.get("event_started", False)
+        version = current_version()
+        try:
+            wait = float(data.get("wait") or 0)
+        except (TypeError, ValueError):
+            wait = 0
+        if wait > 0 and data.get("version") == version:
+            if not park_until(lambda: current_version() != data.get("version"), event, wait):
+                return _long_poll_busy()
+            version = current_version()
+        if data.get("version") == version:
+            _count_conditional("not_modified")
+            return jsonify({"unchanged": True, "version": version})
+        _count_conditional("full")
+
+        roster = build_reported_teams(event)
+        roster["version"] = version
+        return jsonify(roster)
+        
+    except Exception as e:
+        print(f"ERROR in get_reported_teams: {e}")
+        return jsonify({"error": "Failed to load team data", "teams": []})
 
-                # Use vectorized lookup instead of DataFrame filtering
-                reg_data = df[df[mapping["reg_no"]] == reg_no]
-                if reg_data.empty:
-                    continue
 
-                team = get_team_for_reg(reg_no, reg_data.iloc[0], mapping, status)
+def build_reported_teams(event):
+    """{"teams": [...], "event_started": bool} for the reported registrations of event"""
+    # Use cached data
+    df = load_excel()
+    mapping = load_column_map()
+    status = load_status()
 
-                # Optimized data extraction
-                college = str(reg_data.iloc[0].get(mapping.get("college", ""), "")) if mapping.get("college") in df.columns else ""
-                
-                # Optimized contact extraction
-                contact = ""
-                if mapping.get("contact"):
-                    contact_col = mapping["contact"]
-                    if contact_col in df.columns:
-                        val = reg_data.iloc[0][contact_col]
-                        if pd.notna(val):
-                            contact = str(val).strip()
-
-                result.append({
-                    "reg_no": reg_no,
-                    "team": team,
-                    "team_size": len(team),
-                    "college": college,
-                    "contact": contact
-                })
+    result = []
+    event_started = False
+    schema = get_compiled_schema(df, mapping)
+
+    # Only get teams from status - walks just this event's registrations
+    for reg_no in status_regs_for_event(event):
+        info = status.get(reg_no, {})
+        if info.get("reported"):
+            event_started |= info.get("event_started", False)
+            row = _reported_team_row(reg_no, schema)
+            if row is not None:
+                result.append(row)
+
+    return {"teams": result, "event_started": event_started}
+
+def _reported_team_row(reg_no, schema):
+    # O(1) lookup through the reg_no index
+    record = schema.find(reg_no)
+    if record is None:
+        return None
+
+    team = get_team_for_reg(reg_no)
+    college = str(record.college) if record.college is not None else ""
+    contact = str(record.contact).strip() if record.contact is not None else ""
+
+    return {
+        "reg_no": reg_no,
+        "team": team,
+        "team_size": len(team),
+        "college": college,
+        "contact": contact
+    }
+
+
+# --------------------------------------------------
+# 🔁 REPORTED TEAMS DELTA SYNC (PROTECTED)
+# --------------------------------------------------
+@csrf.exempt
+@app.route("/reported_teams_changes", methods=["POST"])
+@event_verified_required
+def reported_teams_changes():
+    """
+    Cursor-based roster sync. Send {"event", "cursor"} with the cursor of the last
+    reply (none at first). The reply carries a new cursor plus either
+    "changed" (added or updated rows) and "removed" (reg_nos), or, when the cursor
+    is unknown or older than the change log, "snapshot": true and the full "teams".
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        event = data.get("event")
+
+        data_version(*REPORTED_TEAMS_RESOURCES)  # Pick up other workers' writes first
+        # Take the cursor before reading rows: anything committed meanwhile is replayed next time
+        now, changed = roster_changes_since(event, data.get("cursor"))
+        cursor = roster_event_id(now)
+
+        if changed is None:
+            roster = build_reported_teams(event)
+            roster.update({"snapshot": True, "cursor": cursor})
+            return jsonify(roster)
+
+        status = load_status()
+        schema = get_compiled_schema(load_excel(), load_column_map())
+        rows = []
+        removed = []
+        for reg_no in changed:
+            info = status.get(reg_no, {})
+            row = None
+            if info.get("event") == event and info.get("reported"):
+                row = _reported_team_row(reg_no, schema)
+            if row is None:
+                removed.append(reg_no)
+            else:
+                rows.append(row)
+
+        started = any(status.get(reg_no, {}).get("reported") and status[reg_no].get("event_started")
+                      for reg_no in status_regs_for_event(event)) if changed else None
+        reply = {"snapshot": False, "cursor": cursor, "changed": rows, "removed": removed}
+        if started is not None:
+            reply["event_started"] = started
+        return jsonify(reply)
 
-        return jsonify({"teams": result, "event_started": event_started})
-        
     except Exception as e:
-        print(f"ERROR in get_reported_teams: {e}")
-        return jsonify({"error": "Failed to load team data", "teams": []})
+        print(f"ERROR in reported_teams_changes: {e}")
+        return jsonify({"error": "Failed to load team changes"}), 500
+
+
+# --------------------------------------------------
+# 📡 LIVE ROSTER STREAM (SERVER-SENT EVENTS)
+# --------------------------------------------------
+@app.route("/reported_teams_stream")
+def reported_teams_stream():
+    """
+    Pushes the event's roster (same payload as /get_reported_teams) whenever a
+    status write, or a registrations change, touches it. Comments go out as a
+    heartbeat; browsers reconnect with Last-Event-ID and only get a snapshot if
+    the roster moved meanwhile. 503 when the worker is at its stream cap, so the
+    page falls back to polling.
+    """
+    event = request.args.get("event")
+    if not event or session.get("verified_event") != event:
+        return jsonify({"error": "Event not verified"}), 403
+    if not _acquire_roster_stream():
+        return jsonify({"error": "Too many live connections, poll instead"}), 503
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+
+    def stream():
+        try:
+            yield f"retry: {ROSTER_STREAM_RETRY_MS}\n\n"
+            seq = roster_feed_seq(event)
+            last_sent = None
+            if last_event_id != roster_event_id(seq):
+                last_sent = json.dumps(build_reported_teams(event))
+                yield f"id: {roster_event_id(seq)}\nevent: roster\ndata: {last_sent}\n\n"
+
+            deadline = time.monotonic() + ROSTER_STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                changed = wait_roster_feed(event, seq, ROSTER_STREAM_HEARTBEAT)
+                if changed is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                seq = changed
+                payload = json.dumps(build_reported_teams(event))
+                if payload != last_sent:
+                    last_sent = payload
+                    yield f"id: {roster_event_id(seq)}\nevent: roster\ndata: {payload}\n\n"
+            # Closing makes the browser reconnect with Last-Event-ID, freeing this thread meanwhile
+        finally:
+            _release_roster_stream()
+
+    response = app.response_class(stream_with_context(stream()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Don't let nginx-style proxies buffer the stream
+    return response
 
 
 # --------------------------------------------------
@@ -1702,16 +4324,11 @@ def approve_event_request():
         
         save_event_requests(requests)
         
-        # Enable the event in status.json
-        status = load_status()
+        # Enable the event in status
         event_name = requests[request_id]["event"]
         
         # Find all registrations for this event and mark as enabled
-        for reg_no, info in status.items():
-            if info.get("event") == event_name:
-                info["event_enabled"] = True
-        
-        save_status(status)
+        update_status({reg_no: {"event_enabled": True} for reg_no in status_regs_for_event(event_name)})
         
         # Send notification to coordinator
         coordinator_contact = requests[request_id]["coordinator_contact"]
@@ -1787,20 +4404,13 @@ def reject_event_request():
 @app.route("/start_event", methods=["POST"])
 def start_event():
     data = request.get_json(silent=True) or {}
-    event = data.get("event")
-
-    status = load_status()
+    event = resolve_event_name(data.get("event"))
 
     # Block restart if already completed
-    for s in status.values():
-        if s.get("event") == event and s.get("event_ended"):
-            return jsonify({"error": "Event already completed"}), 400
-
-    for reg in status:
-        if status[reg].get("event") == event:
-            status[reg]["event_started"] = True
+    if event_is_ended(event):
+        return jsonify({"error": "Event already completed"}), 400
 
-    save_status(status)
+    update_status({reg: {"event_started": True} for reg in status_regs_for_event(event)})
     return jsonify({"success": True})
 
 
@@ -1812,7 +4422,7 @@ def start_event():
 def end_event():
     data = request.get_json(silent=True) or {}
     winners = data.get("winners", {})
-    event = data.get("event")
+    event = resolve_event_name(data.get("event"))
 
     if not winners:
         return jsonify({"error": "No winners selected"}), 400
@@ -1832,15 +4442,16 @@ def end_event():
         return jsonify({"error": "Invalid winner data"}), 400
 
     # Block duplicate ending
-    for s in status.values():
-        if s.get("event") == event and s.get("event_ended"):
-            return jsonify({"error": "Event already completed"}), 400
+    if event_is_ended(event):
+        return jsonify({"error": "Event already completed"}), 400
 
+    changes = {}
     for reg_no, pos in winners.items():
-        status[reg_no]["event_ended"] = True
-        status[reg_no]["position"] = pos
+        if reg_no not in status:
+            return jsonify({"error": "Invalid winner data"}), 400
+        changes[reg_no] = {"event_ended": True, "position": pos}
 
-    save_status(status)
+    update_status(changes)
     return jsonify({"success": True})
 
 
@@ -1863,35 +4474,19 @@ def download_event_pdf():
     status = load_status()
     
     result = []
+    schema = get_compiled_schema(df, mapping)
     
-    for reg_no, info in status.items():
-        if info.get("reported") and info.get("event") == event:
-            row = df[df[mapping["reg_no"]] == reg_no]
-            if row.empty:
+    for reg_no in status_regs_for_event(event):
+        info = status.get(reg_no, {})
+        if info.get("reported"):
+            record = schema.find(reg_no)
+            if record is None:
                 continue
             
-            team = get_team_for_reg(reg_no, row.iloc[0], mapping, status)
-            
-            college = ""
-            if mapping.get("college") and mapping["college"] in df.columns:
-                college = str(row.iloc[0][mapping["college"]])
-            
-            contact = ""
-            row_data = row.iloc[0]
-            
-            if mapping.get("contact"):
-                contact_col = mapping["contact"]
-                if contact_col in df.columns:
-                    val = row_data[contact_col]
-                    if pd.notna(val):
-                        contact = str(val).strip()
-                else:
-                    for col in df.columns:
-                        if col.strip().lower() == contact_col.strip().lower():
-                            val = row_data[col]
-                            if pd.notna(val):
-                                contact = str(val).strip()
-                            break
+            team = get_team_for_reg(reg_no)
+            college = str(record.college) if record.college is not None else ""
+            # The schema matches the contact column case-insensitively
+            contact = str(record.contact).strip() if record.contact is not None else ""
             
             result.append({
                 "reg_no": reg_no,
@@ -2060,19 +4655,19 @@ def reset_winners():
         return jsonify({"error": "Event name required"}), 400
     
     status = load_status()
-    reset_count = 0
+    changes = {}
     
     # Reset event_ended and position for all teams in this event
-    for reg_no, team_status in status.items():
-        if team_status.get("event") == event and team_status.get("event_ended"):
-            team_status["event_ended"] = False
-            team_status.pop("position", None)  # Remove position
-            reset_count += 1
+    for reg_no in status_regs_for_event(event):
+        if status.get(reg_no, {}).get("event_ended"):
+            changes[reg_no] = {"event_ended": False}
+    reset_count = len(changes)
     
     if reset_count == 0:
         return jsonify({"error": "No winners found for this event"}), 404
     
-    save_status(status)
+    # Remove position
+    update_status(changes, remove={reg_no: ["position"] for reg_no in changes})
     return jsonify({
         "success": True, 
         "message": f"Reset {reset_count} winner(s) for event '{event}'"
@@ -2083,6 +4678,7 @@ def reset_winners():
 
 @csrf.exempt
 @app.route("/completed_events")
+@conditional_get(*REPORTED_TEAMS_RESOURCES, long_poll=True)
 def completed_events():
     status = load_status()
     completed = {}
@@ -2101,14 +4697,12 @@ def completed_events():
             
             if df is not None and not df.empty and mapping and mapping.get("reg_no"):
                 try:
-                    row = df[df[mapping["reg_no"]] == reg_no]
-                    if not row.empty:
-                        team = get_team_for_reg(reg_no, row.iloc[0], mapping, status)
+                    record = get_compiled_schema(df, mapping).find(reg_no)
+                    if record is not None:
+                        team = get_team_for_reg(reg_no)
                         # Get college name
-                        if mapping.get("college") and mapping["college"] in df.columns:
-                            college_val = row.iloc[0][mapping["college"]]
-                            if pd.notna(college_val):
-                                college = str(college_val)
+                        if record.college is not None:
+                            college = str(record.college)
                 except:
                     team = []
                     college = ""
@@ -2140,6 +4734,7 @@ def set_event_rating():
     if rating not in [1, 2, 3, 4, 5]:
         return jsonify({"error": "Rating must be between 1 and 5"})
     
+    event = resolve_event_name(event)
     ratings = load_event_ratings()
     ratings[event] = rating
     save_event_ratings(ratings)
@@ -2147,60 +4742,11 @@ def set_event_rating():
 
 @app.route("/super_admin_dashboard")
 @role_required("super_admin")
+@conditional_get(*EVENT_VIEW_RESOURCES)
 def super_admin_dashboard():
     try:
-        print("DEBUG: Loading super admin dashboard...")
-        df = load_excel()
-        mapping = load_column_map()
-        status = load_status()
-        ratings = load_event_ratings()
-        
-        print(f"DEBUG: Status loaded: {status}")
-        print(f"DEBUG: Ratings loaded: {ratings}")
-        print(f"DEBUG: Excel shape: {df.shape}")
-        print(f"DEBUG: Mapping: {mapping}")
-
-        events = {}
-        
-        # First, get all events from Excel file (source of truth)
-        if mapping and mapping.get("event") in df.columns:
-            excel_events = df[mapping["event"]].dropna().unique().tolist()
-            excel_events = [e for e in excel_events if str(e).strip()]  # Remove empty values
-            
-            # Initialize all events with default values
-            for event in excel_events:
-                events[event] = {
-                    "event_started": False,
-                    "event_ended": False,
-                    "winners": {},
-                    "rating": ratings.get(event, 3)  # Default to 3 stars
-                }
-
-        # Then, update with status information
-        for reg_no, data in status.items():
-            event = data.get("event")
-            if not event:
-                continue
-
-            # Only process events that exist in our events dict
-            if event not in events:
-                events[event] = {
-                    "event_started": False,
-                    "event_ended": False,
-                    "winners": {},
-                    "rating": ratings.get(event, 3)
-                }
-
-            # Update event status
-            if data.get("event_started"):
-                events[event]["event_started"] = True
-            if data.get("event_ended"):
-                events[event]["event_ended"] = True
-            if "winners" in data:
-                events[event]["winners"] = data["winners"]
-
-        print(f"DEBUG: Final events data: {events}")
-        return jsonify(events)
+        # Events from the Excel file (source of truth) plus any only known from status
+        return jsonify(get_event_dashboard())
         
     except Exception as e:
         print(f"ERROR in super_admin_dashboard: {e}")
@@ -2213,62 +4759,7 @@ def super_admin_dashboard():
 def calculate_champion():
     try:
         print("DEBUG: Calculating champion...")
-        status = load_status()
-        ratings = load_event_ratings()
-        df = load_excel()
-        mapping = load_column_map()
-        
-        print(f"DEBUG: Status for champion calc: {status}")
-        print(f"DEBUG: Ratings for champion calc: {ratings}")
-        
-        college_points = {}
-        
-        for reg_no, data in status.items():
-            if not data.get("event_ended") or "position" not in data:
-                continue
-            
-            event = data.get("event")
-            position = data.get("position")
-            rating = ratings.get(event, 3)  # Default to 3 stars
-            
-            # Get college name
-            college = ""
-            try:
-                row = df[df[mapping["reg_no"]] == reg_no]
-                if not row.empty:
-                    college = str(row.iloc[0][mapping["college"]]) if pd.notna(row.iloc[0][mapping["college"]]) else ""
-            except:
-                pass
-            
-            if not college:
-                continue
-            
-            # Calculate points
-            points = POINTS_SYSTEM.get(rating, POINTS_SYSTEM[3])
-            position_key = "1st" if position == 1 else "2nd" if position == 2 else "3rd"
-            points_awarded = points.get(position_key, 0)
-            
-            college_points.setdefault(college, {"total": 0, "wins": []})
-            college_points[college]["total"] += points_awarded
-            college_points[college]["wins"].append({
-                "event": event,
-                "position": position,
-                "points": points_awarded,
-                "rating": rating
-            })
-        
-        # Sort by total points
-        sorted_colleges = sorted(college_points.items(), key=lambda x: x[1]["total"], reverse=True)
-        
-        result = []
-        for college, data in sorted_colleges:
-            result.append({
-                "college": college,
-                "total_points": data["total"],
-                "wins": data["wins"]
-            })
-        
-        return jsonify({"champions": result})
+        return jsonify({"champions": get_standings()})
     
     except Exception as e:
         print(f"Error calculating champion: {e}")
@@ -2276,6 +4767,40 @@ def calculate_champion():
         traceback.print_exc()
         return jsonify({"error": "Failed to calculate champion"}), 500
 
+@app.route("/recompute_champion", methods=["POST"])
+@role_required("super_admin")
+def recompute_champion():
+    """Audit: recompute standings from scratch and rebuild the live leaderboard from them"""
+    try:
+        standings = recompute_standings()
+        live = get_standings()
+        with _status_lock:
+            _leaderboard_pending.add(None)
+        # Win lists are in result order, which differs between the two: compare them as sets
+        def summary(rows):
+            return [(row["college"], row["total_points"],
+                     sorted((str(w["event"]), str(w["position"]), w["points"]) for w in row["wins"]))
+                    for row in rows]
+        return jsonify({"champions": standings, "matches_leaderboard": summary(standings) == summary(live)})
+    except Exception as e:
+        print(f"Error recomputing champion: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": "Failed to recompute champion"}), 500
+
+@app.route("/leaderboard")
+@conditional_get(*EVENT_VIEW_RESOURCES)
+def leaderboard():
+    """Championship standings for the public screen; ?top=k limits it to the first k colleges"""
+    top = request.args.get("top", type=int)
+    if top is not None and top < 0:
+        return jsonify({"error": "top must be a non-negative number"}), 400
+    try:
+        return jsonify({"champions": get_standings(top)})
+    except Exception as e:
+        print(f"Error reading leaderboard: {e}")
+        return jsonify({"error": "Failed to load leaderboard"}), 500
+
 # ---------- SPOT REGISTRATION ---------- #
 
 @app.route("/spot-registration")
@@ -2379,12 +4904,8 @@ def submit_spot_registration():
         if not email:
             print(f"DEBUG: Validation failed - Email is empty")
             return jsonify({"error": "Email address is required"}), 400
-        if not reg_no:
-            print(f"DEBUG: Validation failed - Reg No is empty")
-            return jsonify({"error": "Registration number is required"}), 400
-        
-        # Validate registration number format
-        if not reg_no.startswith("C26") or len(reg_no) != 7:
+        # Validate registration number format (a blank one is assigned by the allocator)
+        if reg_no and (not reg_no.startswith(REG_NO_PREFIX) or len(reg_no) != len(REG_NO_PREFIX) + REG_NO_DIGITS):
             print(f"DEBUG: Validation failed - Invalid reg number format: {reg_no}")
             return jsonify({"error": "Registration number must be C26 followed by 4 digits (e.g., C261234)"}), 400
         
@@ -2395,8 +4916,9 @@ def submit_spot_registration():
             print(f"DEBUG: Validation failed - Invalid email format: {email}")
             return jsonify({"error": "Please enter a valid email address"}), 400
         
-        # Validate team requirements
-        requirements = EVENT_TEAM_REQUIREMENTS.get(event, {"min": 1, "max": 20})
+        # Validate team requirements against the event's canonical spelling, which is also what gets stored
+        event = resolve_event_name(event)
+        requirements = get_event_catalog().requirements(event)
         min_members = requirements["min"]
         max_members = requirements["max"]
         print(f"DEBUG: Event requirements for '{event}': min={min_members}, max={max_members}")
@@ -2416,31 +4938,31 @@ def submit_spot_registration():
             print(f"DEBUG: Validation failed - Team size {team_size} > max {max_members}")
             return jsonify({"error": f"This event allows maximum {max_members} team member{'s' if max_members > 1 else ''}"}), 400
         
-        # Load existing Excel and column mapping
-        print(f"DEBUG: Loading Excel file and column mapping...")
-        df = load_excel()
+        # Workbook columns and column mapping; both are cached per workbook generation, so
+        # the submission never builds the journal overlay (duplicates are checked on append)
+        print(f"DEBUG: Loading Excel columns and column mapping...")
+        columns = read_excel_columns()  # The cached frame may not hold every column
         mapping = load_column_map()
-        print(f"DEBUG: Excel loaded with shape: {df.shape}")
         print(f"DEBUG: Column mapping: {mapping}")
         
         if not mapping:
             print(f"DEBUG: Column mapping is None/empty")
             return jsonify({"error": "Column mapping not configured. Please contact admin."}), 500
         
-        # Check if registration number already exists
-        print(f"DEBUG: Checking if registration number '{reg_no}' already exists...")
         reg_column = mapping["reg_no"]
-        if reg_column in df.columns:
-            existing_regs = df[reg_column].astype(str).str.strip()
-            if reg_no in existing_regs.values:
-                print(f"DEBUG: Registration number '{reg_no}' already exists in Excel")
-                return jsonify({"error": "Registration number already exists"}), 400
-            else:
-                print(f"DEBUG: Registration number '{reg_no}' is unique")
-        else:
+        if reg_column not in columns:
             print(f"DEBUG: Registration column '{reg_column}' not found in Excel")
             return jsonify({"error": "Registration column not found in Excel. Please contact admin."}), 500
         
+        # Assign the next free registration number if none was given
+        assigned = not reg_no
+        if assigned:
+            try:
+                reg_no = allocate_reg_nos()[0]
+            except Exception as e:
+                return jsonify({"error": f"Failed to assign a registration number: {str(e)}"}), 500
+            print(f"DEBUG: Assigned registration number '{reg_no}'")
+        
         # Create new row data
         new_row = {}
         
@@ -2484,20 +5006,11 @@ def submit_spot_registration():
             for i, member in enumerate(team_members):
                 # Try to find columns like "Student 2", "Student 3", etc.
                 col_name = f"Student {i + 2}"  # Student 2, 3, 4...
-                if col_name in df.columns:
+                if col_name in columns:
                     new_row[col_name] = member
         
         # Add contact and email if columns exist in Excel
-        # Try to find contact/email columns or add them
-        contact_col = None
-        email_col = None
-        
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if "contact" in col_lower or "phone" in col_lower or "mobile" in col_lower:
-                contact_col = col
-            if "email" in col_lower:
-                email_col = col
+        contact_col, email_col = spot_contact_columns()
         
         if contact_col:
             new_row[contact_col] = contact
@@ -2505,41 +5018,56 @@ def submit_spot_registration():
             new_row[email_col] = email
         
         # Fill missing columns with empty string
-        for col in df.columns:
+        for col in columns:
             if col not in new_row:
                 new_row[col] = ""
         
-        # Append new row to dataframe
-        new_df = pd.DataFrame([new_row])
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Save to Excel with file locking
-        # Use a lock file to prevent concurrent writes
-        lock_file_path = EXCEL_PATH + '.lock'
+        # Append to the spot registration journal; it is visible through load_excel()
+        # right away and folded into the workbook by the background compactor
         try:
-            with portalocker.Lock(lock_file_path, 'w', timeout=5) as lock:
-                # Write Excel file while lock is held
-                with pd.ExcelWriter(EXCEL_PATH, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Sheet1')
+            while not append_spot_registration(reg_no, new_row):
+                print(f"DEBUG: Registration number '{reg_no}' was registered concurrently")
+                if not assigned:
+                    return jsonify({"error": "Registration number already exists"}), 400
+                # Someone typed our assigned number in first: take the next one
+                reg_no = allocate_reg_nos()[0]
+                new_row[mapping["reg_no"]] = reg_no
         except portalocker.exceptions.LockException:
-            return jsonify({"error": "File is currently being updated by another user. Please wait a moment and try again."}), 503
-        except PermissionError as e:
-            return jsonify({"error": "Excel file is currently open in another program. Please close Excel and try again."}), 503
+            return jsonify({"error": "Registrations are currently being updated by another user. Please wait a moment and try again."}), 503
         except Exception as e:
             return jsonify({"error": f"Failed to save registration: {str(e)}"}), 500
         
-        # Invalidate cache so new data is visible immediately
-        invalidate_cache()
-        
         return jsonify({
             "success": True,
-            "message": "Spot registration successful! Your data has been added.",
+            "message": (f"Spot registration successful! Your registration number is {reg_no}." if assigned
+                        else "Spot registration successful! Your data has been added."),
             "reg_no": reg_no
         })
         
     except Exception as e:
         return jsonify({"error": f"Registration failed: {str(e)}"}), 500
 
+@csrf.exempt
+@app.route("/reserve_reg_numbers", methods=["POST"])
+@role_required("register", "admin", "super_admin")
+def reserve_reg_numbers():
+    """Reserve a block of registration numbers for a desk to hand out offline"""
+    data = request.get_json(silent=True) or {}
+    desk = str(data.get("desk") or session.get("username") or "desk").strip()
+    try:
+        count = int(data.get("count", 10))
+    except (TypeError, ValueError):
+        return jsonify({"error": "count must be a number"}), 400
+    if count < 1 or count > REG_BLOCK_MAX:
+        return jsonify({"error": f"count must be between 1 and {REG_BLOCK_MAX}"}), 400
+    
+    try:
+        reg_nos = allocate_reg_nos(count, desk=desk)
+    except Exception as e:
+        return jsonify({"error": f"Failed to reserve registration numbers: {str(e)}"}), 500
+    
+    return jsonify({"success": True, "desk": desk, "reg_nos": reg_nos})
+
 # ---------------- ADMIN OPTIONS ---------------- #
 
 @csrf.exempt
@@ -2554,17 +5082,12 @@ def check_event_start_permission():
         if not event:
             return jsonify({"error": "Event name required"}), 400
         
-        # Get current registration from session or status
-        status = load_status()
-        
-        # Find any registration for this event to check permission
-        for reg_no, reg_data in status.items():
-            if reg_data.get("event") == event:
-                is_enabled = reg_data.get("event_started", False)
-                return jsonify({
-                    "success": True,
-                    "enabled": is_enabled
-                })
+        # The registration desk enables every registration of the event at once
+        if status_regs_for_event(event):
+            return jsonify({
+                "success": True,
+                "enabled": event_is_started(event)
+            })
         
         # If no registration found, check if any registration exists for this event
         df = load_excel()
@@ -2595,17 +5118,12 @@ def reset_all_events():
         status = load_status()
         
         # Clear all event-related data
-        for reg_no in list(status.keys()):
-            if "event" in status[reg_no]:
-                del status[reg_no]["event"]
-            if "event_started" in status[reg_no]:
-                del status[reg_no]["event_started"]
-            if "event_ended" in status[reg_no]:
-                del status[reg_no]["event_ended"]
-            if "position" in status[reg_no]:
-                del status[reg_no]["position"]
-        
-        save_status(status)
+        event_keys = ["event", "event_started", "event_ended", "position"]
+        update_status({}, remove={
+            reg_no: event_keys
+            for reg_no, entry in status.items()
+            if any(k in entry for k in event_keys)
+        })
         
         return jsonify({
             "success": True,
@@ -2644,14 +5162,15 @@ def toggle_event_start():
         reg_numbers = event_registrations[mapping["reg_no"]].tolist()
         
         # Update status for all registrations of this event
+        changes = {}
         for reg_no in reg_numbers:
-            if reg_no not in status:
-                status[reg_no] = {}
-            status[reg_no]["event"] = event
+            if not normalize_reg_no(reg_no):
+                continue
+            reg_no = canonical_reg_no(reg_no)
             # Only enable the event for coordinator, don't mark as started
-            status[reg_no]["event_started"] = enable
+            changes[reg_no] = {"event": event, "event_started": enable}
         
-        save_status(status)
+        update_status(changes)
         
         action = "enabled" if enable else "disabled"
         return jsonify({
@@ -2676,45 +5195,41 @@ def upload_excel():
     if not file.filename.endswith(('.xlsx', '.xls')):
         return jsonify({"error": "File must be an Excel file (.xlsx or .xls)"}), 400
     
+    upload_path = EXCEL_PATH + ".upload.tmp.xlsx"
     try:
-        # Create backup of current Excel file
-        import shutil
-        from datetime import datetime
-        backup_path = f"data/registrations_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        if os.path.exists(EXCEL_PATH):
-            shutil.copy2(EXCEL_PATH, backup_path)
-        
-        # Save new Excel file
-        file.save(EXCEL_PATH)
-        
-        # Validate the Excel file has required columns
-        df = pd.read_excel(EXCEL_PATH)
+        # Save the upload beside the workbook and validate it before it replaces anything
+        file.save(upload_path)
+        columns = _read_header(upload_path)
         mapping = load_column_map()
         
         if not mapping:
+            os.remove(upload_path)
             return jsonify({"error": "Column mapping not configured. Please set up column mapping first."}), 400
         
         # Check if required columns exist
         missing_cols = []
         for key, col_name in mapping.items():
-            if key in ['reg_no', 'event', 'college'] and col_name not in df.columns:
+            if key in ['reg_no', 'event', 'college'] and col_name not in columns:
                 missing_cols.append(col_name)
         
         if missing_cols:
-            # Restore backup if validation fails
-            if os.path.exists(backup_path):
-                shutil.move(backup_path, EXCEL_PATH)
+            os.remove(upload_path)
             return jsonify({"error": f"Missing required columns: {', '.join(missing_cols)}"}), 400
         
+        # The workbook writer backs up the current file (with pending edits) and swaps in the upload
+        backup_path = submit_workbook_job("replace", path=upload_path).result(WORKBOOK_EDIT_TIMEOUT)
+        
         # Clear status.json when Excel is replaced
         save_status({})
         
         return jsonify({
             "success": True,
-            "message": f"Excel file uploaded successfully. Previous file backed up as {os.path.basename(backup_path)}"
+            "message": f"Excel file uploaded successfully. Previous file backed up as {os.path.basename(backup_path or '')}"
         })
         
     except Exception as e:
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
         return jsonify({"error": f"Failed to upload Excel file: {str(e)}"}), 500
 
 @csrf.exempt
@@ -2733,6 +5248,33 @@ def reset_status():
     except Exception as e:
         return jsonify({"error": f"Failed to reset status: {str(e)}"}), 500
 
+@app.route("/cache_stats")
+@role_required("admin", "super_admin")
+def cache_stats():
+    """Workbook cache, status group-commit, spot journal, workbook writer, conditional response and live update stats"""
+    stats = get_excel_cache_stats()
+    stats["status_commits"] = get_status_commit_stats()
+    stats["spot_journal"] = get_spot_journal_stats()
+    stats["workbook_writes"] = get_workbook_write_stats()
+    stats["conditional_responses"] = get_conditional_stats()
+    stats["live_updates"] = get_live_update_stats()
+    return jsonify(stats)
+
+@app.route("/export_status")
+@role_required("admin", "super_admin")
+def export_status():
+    """Export the status database to status.json (legacy format) and download it"""
+    try:
+        export_status_json()
+        return send_file(
+            STATUS_PATH,
+            as_attachment=True,
+            download_name="status.json",
+            mimetype="application/json"
+        )
+    except Exception as e:
+        return jsonify({"error": f"Failed to export status: {str(e)}"}), 500
+
 # ---------------- RUN ---------------- #
 
 if __name__ == "__main__":
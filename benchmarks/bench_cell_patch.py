@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark: single-field workbook edit via full rewrite vs. cell patch vs. deferred journal patch
+
+Usage: python benchmarks/bench_cell_patch.py [rows ...]
+
+"rewrite" is the old pd.read_excel + to_excel path, "cell" opens the workbook with
+openpyxl and sets one cell (openpyxl still parses and saves the whole file, so it
+stays O(rows), just cheaper), and "deferred" journals the patch for the compactor.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+
+import app
+
+MAPPING = {
+    "reg_no": "Registration No",
+    "college": "College Name",
+    "event": "Event",
+    "team_members": [f"Participant-{i}" for i in range(1, 5)]
+}
+RUNS = 3
+
+
+def make_workbook(path, rows):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Registration No", "College Name", "Event"] + MAPPING["team_members"] +
+              [f"Question {i}" for i in range(1, 9)])
+    for i in range(rows):
+        ws.append([f"C26{i:06d}", f"College {i % 300}", f"Event {i % 40}"] +
+                  [f"Student {i}-{m}" for m in range(4)] + [f"Answer {i} {q}" for q in range(8)])
+    wb.save(path)
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def bench(tmp, rows):
+    app.EXCEL_PATH = os.path.join(tmp, f"registrations_{rows}.xlsx")
+    app.SPOT_JOURNAL_PATH = os.path.join(tmp, f"journal_{rows}.ndjson")
+    app.SPOT_JOURNAL_LOCK_PATH = app.SPOT_JOURNAL_PATH + ".lock"
+    app.invalidate_resource("journal")
+    make_workbook(app.EXCEL_PATH, rows)
+    target = f"C26{rows // 2:06d}"
+    cells = {"College Name": "PATCHED COLLEGE"}
+    job = lambda: {"kind": "patch", "patch": (target, cells)}
+
+    rewrite = best_of(lambda: app._rewrite_workbook([job()], [], MAPPING))
+    cell = best_of(lambda: app._patch_workbook([job()], [], MAPPING))
+    deferred = best_of(lambda: app.append_journal_patch(target, cells))
+    print(f"{rows:>7} rows | rewrite {rewrite:9.1f} ms | cell {cell:9.1f} ms | deferred {deferred:6.2f} ms")
+
+
+if __name__ == "__main__":
+    app.SPOT_JOURNAL_COMPACT_INTERVAL = 10 ** 9  # Keep the compactor out of the timings
+    app.SPOT_JOURNAL_COMPACT_ROWS = 10 ** 9
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 5_000, 20_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            bench(tmp, rows)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark: bytes and CPU for polled views, full responses vs. ETag / version polls
+
+Simulates the coordinator (/get_reported_teams), certificate (/completed_events)
+and super admin (/super_admin_dashboard) pages polling against a synthetic
+workbook in a temporary data directory, with a status write every few polls.
+
+Usage: python benchmarks/bench_conditional_polling.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import app as A
+
+ROWS = 5_000
+EVENTS = 20
+POLLS = 300
+WRITE_EVERY = 30  # One status write per this many polls of each endpoint
+CACHE_TIMEOUT = 0.25  # Workbook TTL for the run, well under its length, so TTL expiries are included
+MAPPING = {
+    "reg_no": "Registration No", "event": "Event", "college": "College Name",
+    "contact": "Contact Phone", "team_leader": "Participant-1",
+    "team_members": ["Participant-1", "Participant-2", "Participant-3"]
+}
+
+
+def use_temp_data_dir():
+    data = os.path.join(tempfile.mkdtemp(), "data")
+    os.makedirs(data)
+    for name in dir(A):
+        value = getattr(A, name)
+        if name.endswith("_PATH") and isinstance(value, str) and os.sep + "data" + os.sep in value:
+            setattr(A, name, os.path.join(data, os.path.basename(value)))
+    pd.DataFrame({
+        "Registration No": [f"C26{i:04d}" for i in range(ROWS)],
+        "Event": [f"Event {i % EVENTS}" for i in range(ROWS)],
+        "College Name": [f"College {i % 150}" for i in range(ROWS)],
+        "Contact Phone": [f"9{i:09d}" for i in range(ROWS)],
+        "Participant-1": [f"Leader {i}" for i in range(ROWS)],
+        "Participant-2": [f"Member {i}" for i in range(ROWS)],
+        "Participant-3": [None] * ROWS,
+    }).to_excel(A.EXCEL_PATH, index=False)
+    with open(A.COLUMN_MAP_PATH, "w") as f:
+        json.dump(MAPPING, f)
+    A.invalidate_cache()
+    A.CACHE_TIMEOUT = CACHE_TIMEOUT
+
+
+def seed_status():
+    changes = {}
+    for i in range(0, ROWS, 4):
+        changes[f"C26{i:04d}"] = {"event": f"Event {i % EVENTS}", "reported": True, "event_started": True}
+    for event in range(EVENTS // 2):
+        for position in (1, 2, 3):
+            reg_no = f"C26{event + EVENTS * position * 4:04d}"
+            changes[reg_no] = {"event": f"Event {event}", "event_ended": True, "position": position}
+    A.update_status(changes)
+
+
+def poll(client, conditional):
+    """(bytes, cpu seconds) for POLLS polls of each endpoint"""
+    total_bytes = 0
+    etags = {}
+    version = None
+    write = 0
+    start = time.process_time()
+    for i in range(POLLS):
+        if i and i % WRITE_EVERY == 0:
+            write += 1
+            A.update_status({f"C26{write * 4 + 1:04d}": {"event": "Event 1", "reported": True}})
+
+        body = {"event": "Event 0"}
+        if conditional:
+            body["version"] = version
+        response = client.post("/get_reported_teams", json=body)
+        total_bytes += len(response.data)
+        if conditional:
+            version = response.get_json().get("version", version)
+
+        for url in ("/completed_events", "/super_admin_dashboard"):
+            headers = {"If-None-Match": etags[url]} if conditional and url in etags else {}
+            response = client.get(url, headers=headers)
+            total_bytes += len(response.data)
+            if response.headers.get("ETag"):
+                etags[url] = response.headers["ETag"]
+    return total_bytes, time.process_time() - start
+
+
+def main():
+    use_temp_data_dir()
+    seed_status()
+    A.app.config["TESTING"] = True
+    A.limiter.enabled = False
+    client = A.app.test_client()
+    with client.session_transaction() as session:
+        session["role"] = "super_admin"
+        session["verified_event"] = "Event 0"
+
+    poll(client, False)  # Warm the caches
+    full_bytes, full_cpu = poll(client, False)
+    generation = A.cache_generation("workbook")
+    cond_bytes, cond_cpu = poll(client, True)
+    stats = A.get_excel_cache_stats()
+    print(f"{POLLS} polls x 3 endpoints, one status write per {WRITE_EVERY} polls")
+    print(f"  full        {full_bytes / 1024:9.1f} KiB  cpu {full_cpu * 1e3:8.1f} ms")
+    print(f"  conditional {cond_bytes / 1024:9.1f} KiB  cpu {cond_cpu * 1e3:8.1f} ms")
+    print(f"  saved       {100 * (1 - cond_bytes / full_bytes):8.1f}% bytes  "
+          f"{100 * (1 - cond_cpu / full_cpu):5.1f}% cpu")
+    print(f"  workbook TTL {CACHE_TIMEOUT} s: {stats['unchanged_reloads']} expiries on the unchanged file, "
+          f"workbook generation {generation[0]} -> {A.cache_generation('workbook')[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Benchmark: full vs. projected (usecols + dtypes) workbook ingest
+
+Usage: python benchmarks/bench_ingest.py [path/to/registrations.xlsx]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import app
+from app import RegistrationSchema, load_column_map
+
+RUNS = 3
+
+
+def measure(label, parse):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        df = parse()
+        timings.append(time.perf_counter() - start)
+    memory = df.memory_usage(deep=True).sum()
+    print(f"{label:<10} | {len(df.columns):>4} cols | parse {min(timings) * 1e3:8.1f} ms "
+          f"| resident {memory / 1024:9.1f} KiB")
+    return memory
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        app.EXCEL_PATH = sys.argv[1]
+    mapping = load_column_map()
+    if not mapping:
+        sys.exit("column_map.json is missing; map the workbook columns first")
+    schema = RegistrationSchema(mapping)
+
+    print(f"{app.EXCEL_PATH} ({os.path.getsize(app.EXCEL_PATH) / 1024:.1f} KiB)")
+    full = measure("full", lambda: pd.read_excel(app.EXCEL_PATH))
+    projected = measure("projected", lambda: app._parse_workbook(schema))
+    print(f"resident memory reduced {full / projected:.1f}x")
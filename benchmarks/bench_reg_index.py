@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Benchmark: reg_no index lookup vs. full boolean DataFrame scan
+
+Usage: python benchmarks/bench_reg_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app import find_registration, get_reg_index
+
+MAPPING = {"reg_no": "Registration No", "event": "Event", "college": "College Name"}
+LOOKUPS = 2000
+
+
+def make_frame(rows):
+    return pd.DataFrame({
+        "Registration No": [f"C26{i:06d}" for i in range(rows)],
+        "Event": [f"Event {i % 40}" for i in range(rows)],
+        "College Name": [f"College {i % 300}" for i in range(rows)],
+    })
+
+
+def bench(rows):
+    df = make_frame(rows)
+    targets = [f"C26{(i * 7919) % rows:06d}" for i in range(LOOKUPS)]
+    reg_col = MAPPING["reg_no"]
+
+    start = time.perf_counter()
+    for reg_no in targets:
+        row = df[df[reg_col] == reg_no]
+        if not row.empty:
+            row.iloc[0]
+    scan = (time.perf_counter() - start) / LOOKUPS
+
+    start = time.perf_counter()
+    get_reg_index(df, MAPPING)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for reg_no in targets:
+        find_registration(df, MAPPING, reg_no)
+    indexed = (time.perf_counter() - start) / LOOKUPS
+
+    print(f"{rows:>7} rows | scan {scan * 1e6:9.1f} us | index {indexed * 1e6:6.1f} us "
+          f"| build {build * 1e3:7.1f} ms | speedup {scan / indexed:6.1f}x")
+
+
+if __name__ == "__main__":
+    for rows in (1_000, 10_000, 100_000):
+        bench(rows)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark: vectorized championship recompute vs. the per-winner DataFrame scan
+
+Usage: python benchmarks/bench_standings.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app import POINTS_SYSTEM, EventCatalog, standings_from_winners
+
+MAPPING = {"reg_no": "Registration No", "event": "Event", "college": "College Name"}
+EVENTS = 40
+
+
+def make_frame(rows):
+    return pd.DataFrame({
+        "Registration No": [f"C26{i:06d}" for i in range(rows)],
+        "Event": [f"Event {i % EVENTS}" for i in range(rows)],
+        "College Name": [f"College {i % 300}" for i in range(rows)],
+    })
+
+
+def make_winners(rows, count):
+    step = max(rows // count, 1)
+    return {f"C26{i * step:06d}": (f"Event {(i * step) % EVENTS}", i % 3 + 1) for i in range(count)}
+
+
+def legacy(winners, df, ratings):
+    """The original calculate_champion loop: one boolean filter per winner"""
+    college_points = {}
+    for reg_no, (event, position) in winners.items():
+        rating = ratings.get(event, 3)
+        row = df[df[MAPPING["reg_no"]] == reg_no]
+        if row.empty:
+            continue
+        college = str(row.iloc[0][MAPPING["college"]])
+        points = POINTS_SYSTEM.get(rating, POINTS_SYSTEM[3])
+        position_key = "1st" if position == 1 else "2nd" if position == 2 else "3rd"
+        points_awarded = points.get(position_key, 0)
+        college_points.setdefault(college, {"total": 0, "wins": []})
+        college_points[college]["total"] += points_awarded
+        college_points[college]["wins"].append(
+            {"event": event, "position": position, "points": points_awarded, "rating": rating})
+    return college_points
+
+
+def bench(rows, count):
+    df = make_frame(rows)
+    winners = make_winners(rows, count)
+    ratings = {f"Event {i}": i % 5 + 1 for i in range(EVENTS)}
+    catalog = EventCatalog(df, MAPPING, {}, ratings)
+
+    start = time.perf_counter()
+    expected = legacy(winners, df, ratings)
+    scan = time.perf_counter() - start
+
+    # Cold: this call also builds the reg_no index, like the first recompute after a workbook load
+    start = time.perf_counter()
+    standings = standings_from_winners(winners, df, MAPPING, catalog)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    standings_from_winners(winners, df, MAPPING, catalog)
+    warm = time.perf_counter() - start
+
+    same = {row["college"]: row["total_points"] for row in standings} == \
+        {college: data["total"] for college, data in expected.items()}
+    print(f"{rows:>7} rows {count:>5} winners | per-row {scan * 1e3:9.1f} ms | "
+          f"vectorized cold {cold * 1e3:6.1f} ms, warm {warm * 1e3:6.1f} ms | same totals {same}")
+
+
+if __name__ == "__main__":
+    for rows, count in ((10_000, 500), (50_000, 2_000), (100_000, 5_000)):
+        bench(rows, count)
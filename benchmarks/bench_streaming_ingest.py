@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark: pd.read_excel vs. streaming (openpyxl read_only) ingest of a large workbook
+
+Generates a synthetic registrations workbook and reports parse time and peak
+Python memory (tracemalloc) for each path. tracemalloc slows both parses
+several-fold; compare the timings relative to each other.
+
+Usage: python benchmarks/bench_streaming_ingest.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+import pandas as pd
+
+import app
+from app import RegistrationSchema
+
+MAPPING = {
+    "reg_no": "Registration No",
+    "college": "College Name",
+    "contact": "Contact Phone",
+    "event": "Event",
+    "team_members": [f"Participant-{i}" for i in range(1, 5)]
+}
+EXTRA_COLUMNS = [f"Question {i}" for i in range(1, 16)]
+
+
+def make_workbook(path, rows):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    header = ["Registration No", "College Name", "Contact Phone", "Event"]
+    ws.append(header + MAPPING["team_members"] + EXTRA_COLUMNS)
+    for i in range(rows):
+        ws.append([f"C26{i:06d}", f"College {i % 300}", 9000000000 + i, f"Event {i % 40}"] +
+                  [f"Student {i}-{m}" for m in range(i % 4 + 1)] + [None] * (3 - i % 4) +
+                  [f"Answer {i} {q}" for q in range(len(EXTRA_COLUMNS))])
+    wb.save(path)
+
+
+def measure(label, parse):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = parse()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} | {len(df):>7} rows | parse {elapsed:7.2f} s | peak {peak / 2**20:7.1f} MiB "
+          f"| resident {df.memory_usage(deep=True).sum() / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    schema = RegistrationSchema(MAPPING)
+    with tempfile.TemporaryDirectory() as tmp:
+        app.EXCEL_PATH = os.path.join(tmp, "registrations.xlsx")
+        make_workbook(app.EXCEL_PATH, rows)
+        print(f"{rows} rows, {os.path.getsize(app.EXCEL_PATH) / 2**20:.1f} MiB xlsx")
+        measure("read_excel", lambda: schema.apply_dtypes(pd.read_excel(app.EXCEL_PATH, usecols=schema.wants)))
+        measure("streaming", lambda: app._stream_workbook(schema))